@@ -9,10 +9,9 @@ import yaml
 from typing import Dict, Any, Optional, List, Union
 from pathlib import Path
 import logging
-from dataclasses import dataclass, field, asdict
+import threading
+from dataclasses import dataclass, field, asdict, fields
 from copy import deepcopy
-import shutil
-from datetime import datetime
 
 # 默认配置常量
 DEFAULT_CONFIG = {
@@ -98,6 +97,10 @@ class VisualizationConfig:
             self.allowed_file_types = [".csv", ".xlsx", ".json", ".parquet"]
 
 
+# 配置字段名集合，用于快速判断顶级配置项
+_CFG_FIELD_SET = frozenset(f.name for f in fields(VisualizationConfig))
+
+
 class ConfigManager:
     """配置管理器
     
@@ -120,11 +123,17 @@ class ConfigManager:
         
         # 初始化配置
         self._config = VisualizationConfig()
-        self._config_cache = {}
+        self._config_version = 0  # 配置变更版本号
+        self._export_cache: Dict[tuple, str] = {}  # (格式, 版本号) -> 导出字符串
         
         # 加载配置
         self.load_config()
     
+    def _mark_dirty(self):
+        """标记配置已变更，递增版本号并清空导出缓存"""
+        self._config_version += 1
+        self._export_cache.clear()
+    
     def _get_default_config_path(self) -> Path:
         """获取默认配置文件路径
         
@@ -203,6 +212,8 @@ class ConfigManager:
                 setattr(self._config, key, value)
             else:
                 self.logger.warning(f"未知的配置项: {key}")
+        
+        self._mark_dirty()
     
     def save_config(self, config_path: Optional[str] = None) -> bool:
         """保存配置文件
@@ -331,7 +342,7 @@ class ConfigManager:
             default: 默认值
         
         Returns:
-            Any: 配置值
+            Any: 配置值（dict/list 为副本）
         """
         # 支持点号分隔的嵌套键
         keys = key.split('.')
@@ -345,6 +356,10 @@ class ConfigManager:
                     value = value[k]
                 else:
                     return default
+            # 只有 dict/list 容器返回副本，避免调用方绕过 set() 修改配置导致导出缓存过期；
+            # 标量等不可变值直接返回，不产生复制开销
+            if isinstance(value, (dict, list)):
+                return deepcopy(value)
             return value
         except:
             return default
@@ -359,34 +374,33 @@ class ConfigManager:
         Returns:
             bool: 是否成功设置
         """
+        # 快速路径：绝大多数设置都是顶级属性，无需拆分键
+        if '.' not in key:
+            if key in _CFG_FIELD_SET:
+                setattr(self._config, key, value)
+                self._mark_dirty()
+                return True
+            self.logger.warning(f"未知的配置项: {key}")
+            return False
+        
         try:
-            # 支持点号分隔的嵌套键
+            # 设置点号分隔的嵌套属性
             keys = key.split('.')
-            
-            if len(keys) == 1:
-                # 直接设置顶级属性
-                if hasattr(self._config, key):
-                    setattr(self._config, key, value)
-                    return True
+            obj = self._config
+            for k in keys[:-1]:
+                if hasattr(obj, k):
+                    obj = getattr(obj, k)
                 else:
-                    self.logger.warning(f"未知的配置项: {key}")
+                    self.logger.warning(f"配置路径不存在: {'.'.join(keys[:-1])}")
                     return False
+            
+            if isinstance(obj, dict):
+                obj[keys[-1]] = value
+                self._mark_dirty()
+                return True
             else:
-                # 设置嵌套属性
-                obj = self._config
-                for k in keys[:-1]:
-                    if hasattr(obj, k):
-                        obj = getattr(obj, k)
-                    else:
-                        self.logger.warning(f"配置路径不存在: {'.'.join(keys[:-1])}")
-                        return False
-                
-                if isinstance(obj, dict):
-                    obj[keys[-1]] = value
-                    return True
-                else:
-                    self.logger.warning(f"无法设置配置项: {key}")
-                    return False
+                self.logger.warning(f"无法设置配置项: {key}")
+                return False
                     
         except Exception as e:
             self.logger.error(f"设置配置失败: {e}")
@@ -422,6 +436,7 @@ class ConfigManager:
         """
         try:
             self._config = VisualizationConfig()
+            self._mark_dirty()
             self.logger.info("配置已重置为默认值")
             return True
         except Exception as e:
@@ -435,7 +450,7 @@ class ConfigManager:
             library_name: 库名称
         
         Returns:
-            Dict[str, Any]: 库配置字典
+            Dict[str, Any]: 库配置字典的副本，修改后需通过 set_library_config 写回
         """
         config_key = f"{library_name}_config"
         return self.get(config_key, {})
@@ -480,6 +495,7 @@ class ConfigManager:
                 self._config.custom_themes = {}
             
             self._config.custom_themes[theme_name] = theme_config
+            self._mark_dirty()
             return True
         except Exception as e:
             self.logger.error(f"设置主题配置失败: {e}")
@@ -494,12 +510,21 @@ class ConfigManager:
         Returns:
             str: 配置字符串
         """
+        # 配置未变更时直接复用上次的序列化结果
+        cache_key = (format.lower(), self._config_version)
+        cached = self._export_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         config_dict = asdict(self._config)
         
-        if format.lower() == 'json':
-            return json.dumps(config_dict, indent=2, ensure_ascii=False)
+        if cache_key[0] == 'json':
+            config_str = json.dumps(config_dict, indent=2, ensure_ascii=False)
         else:
-            return yaml.dump(config_dict, default_flow_style=False, allow_unicode=True)
+            config_str = yaml.dump(config_dict, default_flow_style=False, allow_unicode=True)
+        
+        self._export_cache[cache_key] = config_str
+        return config_str
     
     def import_config(self, config_str: str, format: str = 'yaml') -> bool:
         """从字符串导入配置
@@ -542,6 +567,7 @@ class ConfigManager:
 
 # 全局配置管理器实例
 _global_config_manager = None
+_global_config_manager_lock = threading.Lock()
 
 
 def get_config_manager() -> ConfigManager:
@@ -552,7 +578,9 @@ def get_config_manager() -> ConfigManager:
     """
     global _global_config_manager
     if _global_config_manager is None:
-        _global_config_manager = ConfigManager()
+        with _global_config_manager_lock:
+            if _global_config_manager is None:
+                _global_config_manager = ConfigManager()
     return _global_config_manager
 
 
@@ -575,5 +603,6 @@ def set_config_path(config_path: str) -> bool:
         bool: 是否成功设置
     """
     global _global_config_manager
-    _global_config_manager = ConfigManager(config_path)
+    with _global_config_manager_lock:
+        _global_config_manager = ConfigManager(config_path)
     return True
\ No newline at end of file
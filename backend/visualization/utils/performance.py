@@ -3,21 +3,199 @@
 提供可视化系统的性能监控功能，包括渲染时间、内存使用、缓存命中率等指标的监控和分析
 """
 
+import sys
 import time
+import math
+import itertools
 import psutil
+import numpy as np
 import threading
 import json
+import csv
 import logging
 from typing import Dict, List, Any, Optional, Callable
-from dataclasses import dataclass, asdict
-from collections import defaultdict, deque
+from dataclasses import dataclass
+from collections import defaultdict
 from datetime import datetime, timedelta
-import statistics
 from functools import wraps
-import gc
-import tracemalloc
+from contextlib import contextmanager
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class _RWLock:
+    """读写锁
+    
+    允许多个读者并发访问，写者独占访问；有写者等待时阻止新读者进入，避免写者饥饿
+    """
+    
+    __slots__ = ('_cond', '_readers', '_writer_active', '_writers_waiting')
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer_active = False
+        self._writers_waiting = 0
+    
+    @contextmanager
+    def gen_rlock(self):
+        """获取读锁"""
+        with self._cond:
+            while self._writer_active or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._cond.notify_all()
+    
+    @contextmanager
+    def gen_wlock(self):
+        """获取写锁"""
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer_active or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer_active = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer_active = False
+                self._cond.notify_all()
+
+
+class _AtomicCounter:
+    """线程安全计数器
+    
+    计数值为普通整数，递增在锁内完成；读取整数引用本身是原子的，无需加锁
+    """
+    
+    __slots__ = ('_lock', '_value')
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0
+    
+    def increment(self):
+        """计数加一"""
+        with self._lock:
+            self._value += 1
+    
+    def add(self, n: int):
+        """计数加 n"""
+        if n > 0:
+            with self._lock:
+                self._value += n
+    
+    @property
+    def value(self) -> int:
+        """当前计数值"""
+        return self._value
+
+
+class _RingBuffer:
+    """固定容量环形缓冲区
+    
+    槽位在初始化时一次性分配，写入只覆盖槽位并移动头指针，不产生节点分配；
+    写满后覆盖最旧的记录
+    """
+    
+    __slots__ = ('capacity', '_slots', '_head', '_count')
+    
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"环形缓冲区容量必须大于 0: {capacity}")
+        self.capacity = capacity
+        self._slots: List[Any] = [None] * capacity
+        self._head = 0  # 下一个写入位置
+        self._count = 0
+    
+    def append(self, item: Any) -> Any:
+        """写入一条记录
+        
+        Returns:
+            Any: 被覆盖的最旧记录，缓冲区未满时为 None
+        """
+        head = self._head
+        evicted = self._slots[head]
+        self._slots[head] = item
+        self._head = (head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+            return None
+        return evicted
+    
+    def clear(self):
+        """清空缓冲区"""
+        self._slots = [None] * self.capacity
+        self._head = 0
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index: int) -> Any:
+        """按逻辑下标取记录，0 为最旧的一条"""
+        if not 0 <= index < self._count:
+            raise IndexError('ring buffer index out of range')
+        return self._slots[(self._head - self._count + index) % self.capacity]
+    
+    def __iter__(self):
+        """按写入顺序（从旧到新）遍历"""
+        return self.iter_from(0)
+    
+    def iter_from(self, index: int):
+        """从逻辑下标 index 开始按写入顺序遍历"""
+        start = (self._head - self._count) % self.capacity
+        for i in range(index, self._count):
+            yield self._slots[(start + i) % self.capacity]
+    
+    def __reversed__(self):
+        """按写入逆序（从新到旧）遍历"""
+        last = self._head - 1
+        for i in range(self._count):
+            yield self._slots[(last - i) % self.capacity]
+    
+    def tail(self, limit: Optional[int] = None) -> List[Any]:
+        """取最近写入的 limit 条记录（从旧到新），只复制所需的部分
+        
+        Args:
+            limit: 数量限制，为空或 0 时返回全部
+        """
+        if not limit or limit >= self._count:
+            return list(self)
+        records = list(itertools.islice(reversed(self), limit))
+        records.reverse()
+        return records
+    
+    def bisect_left(self, value: Any, key: Callable[[Any], Any]) -> int:
+        """在按 key 有序的缓冲区中二分查找第一个 key >= value 的逻辑下标
+        
+        Args:
+            value: 查找值
+            key: 从记录中取比较键的函数
+        
+        Returns:
+            int: 逻辑下标，所有记录都小于 value 时返回长度
+        """
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key(self[mid]) < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
 
 @dataclass
 class PerformanceMetric:
@@ -35,7 +213,13 @@ class PerformanceMetric:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {
+            'timestamp': self.timestamp,
+            'metric_name': self.metric_name,
+            'value': self.value,
+            'unit': self.unit,
+            'tags': dict(self.tags)
+        }
 
 
 @dataclass
@@ -54,7 +238,68 @@ class RenderPerformance:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {
+            'chart_type': self.chart_type,
+            'library': self.library,
+            'data_points': self.data_points,
+            'render_time': self.render_time,
+            'memory_usage': self.memory_usage,
+            'file_size': self.file_size,
+            'timestamp': self.timestamp,
+            'success': self.success,
+            'error_message': self.error_message
+        }
+
+
+def _describe(values: np.ndarray, with_stdev: bool = True) -> Dict[str, Any]:
+    """计算一组数值的描述统计
+    
+    Args:
+        values: 数值数组
+        with_stdev: 是否计算样本标准差
+    
+    Returns:
+        Dict[str, Any]: 包含 min/max/mean/median（及 stdev）的字典
+    """
+    summary = {
+        'min': values.min().item(),
+        'max': values.max().item(),
+        'mean': float(values.mean()),
+        'median': float(np.median(values))
+    }
+    if with_stdev:
+        summary['stdev'] = float(values.std(ddof=1)) if len(values) > 1 else 0
+    return summary
+
+
+def _render_timestamp(performance_data: RenderPerformance) -> float:
+    """取渲染记录的时间戳，用作二分查找的键"""
+    return performance_data.timestamp
+
+
+# 渲染记录导出为 CSV 时的列顺序
+_RENDER_CSV_FIELDS = (
+    'chart_type', 'library', 'data_points', 'render_time', 'memory_usage',
+    'file_size', 'timestamp', 'success', 'error_message'
+)
+
+# 指标对象池容量上限
+_METRIC_POOL_SIZE = 1024
+
+# Python 版本字符串
+_PY_VERSION = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
+
+# 当前进程句柄，复用以避免每次采样都重新构造
+_PROCESS = psutil.Process()
+
+
+def _new_group_stats() -> Dict[str, Any]:
+    """创建空的分组统计项"""
+    return {
+        'count': 0,
+        'total_time': 0.0,
+        'total_memory': 0
+    }
 
 
 class PerformanceMonitor:
@@ -63,61 +308,205 @@ class PerformanceMonitor:
     监控和记录可视化系统的各种性能指标
     """
     
-    def __init__(self, max_history: int = 1000, enable_memory_profiling: bool = False):
+    def __init__(self, max_history: int = 1000, enable_memory_profiling: bool = False,
+                 enable_detailed_cache_tracing: bool = False, memory_snapshot_interval: float = 60.0):
         """初始化性能监控器
         
         Args:
             max_history: 最大历史记录数
             enable_memory_profiling: 是否启用内存分析
+            enable_detailed_cache_tracing: 是否为每次缓存命中/未命中记录指标
+            memory_snapshot_interval: 内存快照最小间隔（秒），间隔内复用上次的分析结果
         """
         self.logger = logging.getLogger(__name__)
         self.max_history = max_history
         self.enable_memory_profiling = enable_memory_profiling
+        self.enable_detailed_cache_tracing = enable_detailed_cache_tracing
         
         # 性能指标存储
-        self.metrics_history: deque = deque(maxlen=max_history)
-        self.render_history: deque = deque(maxlen=max_history)
+        self.metrics_history = _RingBuffer(max_history)
+        self._metric_pool: List[PerformanceMetric] = []  # 被淘汰指标对象的空闲列表
+        self.render_history = _RingBuffer(max_history)
+        # 渲染记录是否按时间戳有序，出现乱序写入后分析时退回线性过滤
+        self._render_history_sorted = True
         
-        # 实时统计
+        # 实时统计：计数类指标使用各自加锁的计数器，累计值在写锁内更新
+        self._reset_counters()
         self.current_stats = {
-            'total_renders': 0,
-            'successful_renders': 0,
-            'failed_renders': 0,
             'total_render_time': 0.0,
-            'total_memory_usage': 0,
-            'cache_hits': 0,
-            'cache_misses': 0
+            'total_memory_usage': 0
         }
+        self._reset_render_time_moments()
         
-        # 按类型分组的统计
-        self.stats_by_type = defaultdict(lambda: {
-            'count': 0,
-            'total_time': 0.0,
-            'total_memory': 0,
-            'avg_time': 0.0,
-            'avg_memory': 0.0
-        })
-        
-        # 按库分组的统计
-        self.stats_by_library = defaultdict(lambda: {
-            'count': 0,
-            'total_time': 0.0,
-            'total_memory': 0,
-            'avg_time': 0.0,
-            'avg_memory': 0.0
-        })
+        # 按类型/按库分组的统计：每个线程写入各自的分片，读取时合并
+        # 分组名被映射为整数 id，分片中按 id 存放 (count, total_time, total_memory) 行；
+        # 行为不可变元组，写入时整行替换，读者复制分片时不会看到只更新了一半的行
+        # 已退出线程的分片会被并入基础汇总后移除，分片数不随线程更替增长
+        self._group_ids: Dict[str, Dict[str, int]] = {'type': {}, 'library': {}}
+        self._group_names: Dict[str, List[str]] = {'type': [], 'library': []}
+        self._tls = threading.local()
+        self._stat_shards: List[tuple] = []
+        self._stat_base: Dict[str, List[list]] = {'type': [], 'library': []}
+        self._shard_generation = 0
+        self._shard_lock = threading.Lock()
         
         # 系统资源监控
         self.system_monitor_enabled = False
         self.system_monitor_thread = None
-        self.system_metrics = deque(maxlen=max_history)
+        self._stop_evt = threading.Event()
+        self.system_metrics = _RingBuffer(max_history)
+        
+        # 进程生命周期内不变的系统总量，只读取一次
+        try:
+            self._cpu_count = psutil.cpu_count()
+            self._memory_total = psutil.virtual_memory().total
+            self._disk_total = psutil.disk_usage('/').total
+        except Exception as e:
+            self.logger.warning(f"读取系统总量信息失败: {e}")
+            self._cpu_count = None
+            self._memory_total = 0
+            self._disk_total = 0
         
         # 内存分析
+        self.memory_snapshot_interval = memory_snapshot_interval
+        self._last_snapshot_time = 0.0
+        self._last_memory_profile: Optional[Dict[str, Any]] = None
         if self.enable_memory_profiling:
+            import tracemalloc
             tracemalloc.start()
         
-        # 锁
-        self._lock = threading.Lock()
+        # 读写锁：统计查询并发读，记录操作独占写
+        self._lock = _RWLock()
+    
+    def _reset_render_time_moments(self):
+        """重置成功渲染耗时的 Welford 累积量（样本数、均值、二阶中心矩）"""
+        self._rt_n = 0
+        self._rt_mean = 0.0
+        self._rt_m2 = 0.0
+    
+    def _merge_render_time_moments(self, n: int, mean: float, m2: float):
+        """合并一组渲染耗时的累积量（Chan 并行合并公式，需持有写锁）
+        
+        Args:
+            n: 该组样本数
+            mean: 该组均值
+            m2: 该组二阶中心矩
+        """
+        if n == 0:
+            return
+        total = self._rt_n + n
+        delta = mean - self._rt_mean
+        self._rt_mean += delta * n / total
+        self._rt_m2 += m2 + delta * delta * self._rt_n * n / total
+        self._rt_n = total
+    
+    def _reset_counters(self):
+        """重置计数器"""
+        self._total_renders = _AtomicCounter()
+        self._successful_renders = _AtomicCounter()
+        self._failed_renders = _AtomicCounter()
+        self._cache_hits = _AtomicCounter()
+        self._cache_misses = _AtomicCounter()
+    
+    def _get_stat_shard(self) -> Dict[str, List[tuple]]:
+        """获取当前线程的分组统计分片，首次访问时创建并注册
+        
+        Returns:
+            Dict[str, List[tuple]]: 包含 'type' 和 'library' 两组统计行的分片
+        """
+        tls = self._tls
+        if getattr(tls, 'generation', None) != self._shard_generation:
+            shard = {'type': [], 'library': []}
+            with self._shard_lock:
+                self._fold_dead_shards()
+                self._stat_shards.append((threading.current_thread(), shard))
+                tls.generation = self._shard_generation
+            tls.shard = shard
+        return tls.shard
+    
+    def _fold_dead_shards(self):
+        """把已退出线程的分片累加进基础汇总并移除，调用方需持有 _shard_lock"""
+        live_shards = []
+        for thread, shard in self._stat_shards:
+            if thread.is_alive():
+                live_shards.append((thread, shard))
+                continue
+            # 线程已退出，分片不会再被写入
+            for kind, rows in shard.items():
+                base_rows = self._stat_base[kind]
+                while len(base_rows) < len(rows):
+                    base_rows.append([0, 0.0, 0])
+                for base_row, row in zip(base_rows, rows):
+                    base_row[0] += row[0]
+                    base_row[1] += row[1]
+                    base_row[2] += row[2]
+        self._stat_shards = live_shards
+    
+    def _add_group_stats(self, shard: Dict[str, List[tuple]], kind: str, name: str,
+                         count: int, total_time: float, total_memory: int):
+        """累加分片中某个分组的统计行，必要时分配 id 并补齐行
+        
+        Args:
+            shard: 当前线程的分片
+            kind: 分组维度 ('type' 或 'library')
+            name: 分组名
+            count: 渲染次数增量
+            total_time: 渲染耗时增量
+            total_memory: 内存使用增量
+        """
+        ids = self._group_ids[kind]
+        group_id = ids.get(name)
+        if group_id is None:
+            with self._shard_lock:
+                group_id = ids.get(name)
+                if group_id is None:
+                    names = self._group_names[kind]
+                    group_id = len(names)
+                    names.append(name)
+                    ids[name] = group_id
+        
+        rows = shard[kind]
+        while len(rows) <= group_id:
+            rows.append((0, 0.0, 0))
+        row = rows[group_id]
+        rows[group_id] = (row[0] + count, row[1] + total_time, row[2] + total_memory)
+    
+    def _merge_stat_shards(self, kind: str) -> Dict[str, Dict[str, Any]]:
+        """合并基础汇总与所有存活线程分片中的分组统计
+        
+        Args:
+            kind: 分组维度 ('type' 或 'library')
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: 合并后的分组统计
+        """
+        with self._shard_lock:
+            self._fold_dead_shards()
+            shard_rows = [[row[:] for row in self._stat_base[kind]]]
+            shard_rows.extend(list(shard[kind]) for _, shard in self._stat_shards)
+            names = list(self._group_names[kind])
+        
+        # 各分片的行按 id 对齐后向量化求和
+        totals = np.zeros((len(names), 3), dtype=np.float64)
+        for rows in shard_rows:
+            if rows:
+                totals[:len(rows)] += np.array(rows, dtype=np.float64)
+        
+        counts = totals[:, 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_times = np.where(counts > 0, totals[:, 1] / counts, 0.0)
+            avg_memories = np.where(counts > 0, totals[:, 2] / counts, 0.0)
+        
+        merged = {}
+        for group_id in np.flatnonzero(counts):
+            merged[names[group_id]] = {
+                'count': int(counts[group_id]),
+                'total_time': float(totals[group_id, 1]),
+                'total_memory': int(totals[group_id, 2]),
+                'avg_time': float(avg_times[group_id]),
+                'avg_memory': float(avg_memories[group_id])
+            }
+        return merged
     
     def start_system_monitoring(self, interval: float = 5.0):
         """启动系统资源监控
@@ -129,6 +518,12 @@ class PerformanceMonitor:
             return
         
         self.system_monitor_enabled = True
+        self._stop_evt.clear()
+        
+        # 预热 CPU 采样基准，之后每次非阻塞调用返回与上次调用之间的占用率
+        psutil.cpu_percent(interval=None)
+        _PROCESS.cpu_percent(interval=None)
+        
         self.system_monitor_thread = threading.Thread(
             target=self._system_monitor_loop,
             args=(interval,),
@@ -140,6 +535,7 @@ class PerformanceMonitor:
     def stop_system_monitoring(self):
         """停止系统资源监控"""
         self.system_monitor_enabled = False
+        self._stop_evt.set()
         if self.system_monitor_thread:
             self.system_monitor_thread.join(timeout=1.0)
         self.logger.info("系统资源监控已停止")
@@ -153,14 +549,13 @@ class PerformanceMonitor:
         while self.system_monitor_enabled:
             try:
                 # 获取系统指标
-                cpu_percent = psutil.cpu_percent(interval=0.1)
+                cpu_percent = psutil.cpu_percent(interval=None)
                 memory = psutil.virtual_memory()
-                disk = psutil.disk_usage('/')
+                disk_used = psutil.disk_usage('/').used
                 
                 # 获取当前进程指标
-                process = psutil.Process()
-                process_memory = process.memory_info()
-                process_cpu = process.cpu_percent()
+                process_memory = _PROCESS.memory_info()
+                process_cpu = _PROCESS.cpu_percent(interval=None)
                 
                 # 记录指标
                 timestamp = time.time()
@@ -168,25 +563,26 @@ class PerformanceMonitor:
                 system_metric = {
                     'timestamp': timestamp,
                     'cpu_percent': cpu_percent,
-                    'memory_total': memory.total,
+                    'memory_total': self._memory_total,
                     'memory_used': memory.used,
                     'memory_percent': memory.percent,
-                    'disk_total': disk.total,
-                    'disk_used': disk.used,
-                    'disk_percent': (disk.used / disk.total) * 100,
+                    'disk_total': self._disk_total,
+                    'disk_used': disk_used,
+                    'disk_percent': (disk_used / self._disk_total) * 100 if self._disk_total else 0.0,
                     'process_memory_rss': process_memory.rss,
                     'process_memory_vms': process_memory.vms,
                     'process_cpu_percent': process_cpu
                 }
                 
-                with self._lock:
+                with self._lock.gen_wlock():
                     self.system_metrics.append(system_metric)
                 
-                time.sleep(interval)
-                
             except Exception as e:
                 self.logger.error(f"系统监控错误: {e}")
-                time.sleep(interval)
+            
+            # 等待下一个周期，停止时立即唤醒
+            if self._stop_evt.wait(interval):
+                break
     
     def record_metric(self, name: str, value: float, unit: str = "", tags: Dict[str, str] = None):
         """记录性能指标
@@ -197,16 +593,28 @@ class PerformanceMonitor:
             unit: 单位
             tags: 标签
         """
-        metric = PerformanceMetric(
-            timestamp=time.time(),
-            metric_name=name,
-            value=value,
-            unit=unit,
-            tags=tags or {}
-        )
+        # 优先复用对象池中被淘汰的指标对象，避免每次记录都分配新对象
+        try:
+            metric = self._metric_pool.pop()
+            metric.timestamp = time.time()
+            metric.metric_name = name
+            metric.value = value
+            metric.unit = unit
+            metric.tags = tags or {}
+        except IndexError:
+            metric = PerformanceMetric(
+                timestamp=time.time(),
+                metric_name=name,
+                value=value,
+                unit=unit,
+                tags=tags or {}
+            )
         
-        with self._lock:
-            self.metrics_history.append(metric)
+        with self._lock.gen_wlock():
+            evicted = self.metrics_history.append(metric)
+        
+        if evicted is not None and len(self._metric_pool) < _METRIC_POOL_SIZE:
+            self._metric_pool.append(evicted)
     
     def record_render_performance(self, performance_data: RenderPerformance):
         """记录渲染性能
@@ -214,48 +622,113 @@ class PerformanceMonitor:
         Args:
             performance_data: 渲染性能数据
         """
-        with self._lock:
+        with self._lock.gen_wlock():
             # 添加到历史记录
-            self.render_history.append(performance_data)
+            self._append_render(performance_data)
             
             # 更新总体统计
-            self.current_stats['total_renders'] += 1
+            self._total_renders.increment()
             if performance_data.success:
-                self.current_stats['successful_renders'] += 1
+                self._successful_renders.increment()
                 self.current_stats['total_render_time'] += performance_data.render_time
                 self.current_stats['total_memory_usage'] += performance_data.memory_usage
+                
+                # Welford 单次更新渲染耗时的均值和二阶中心矩
+                self._rt_n += 1
+                delta = performance_data.render_time - self._rt_mean
+                self._rt_mean += delta / self._rt_n
+                self._rt_m2 += delta * (performance_data.render_time - self._rt_mean)
             else:
-                self.current_stats['failed_renders'] += 1
-            
-            # 更新按类型统计
-            type_stats = self.stats_by_type[performance_data.chart_type]
+                self._failed_renders.increment()
+        
+        # 分组统计写入当前线程的分片，无需全局锁
+        shard = self._get_stat_shard()
+        
+        # 更新按类型统计
+        if performance_data.success:
+            render_time = performance_data.render_time
+            memory_usage = performance_data.memory_usage
+        else:
+            render_time = 0.0
+            memory_usage = 0
+        self._add_group_stats(shard, 'type', performance_data.chart_type, 1, render_time, memory_usage)
+        
+        # 更新按库统计
+        self._add_group_stats(shard, 'library', performance_data.library, 1, render_time, memory_usage)
+    
+    def _append_render(self, performance_data: RenderPerformance):
+        """写入一条渲染记录并维护有序标记，调用方需持有写锁"""
+        history = self.render_history
+        if self._render_history_sorted and len(history) and \
+                performance_data.timestamp < history[len(history) - 1].timestamp:
+            self._render_history_sorted = False
+        history.append(performance_data)
+    
+    def record_render_performance_batch(self, batch: List[RenderPerformance]):
+        """批量记录渲染性能
+        
+        先在锁外完成聚合，再一次性写入历史记录和统计，整个批次只获取一次写锁
+        
+        Args:
+            batch: 渲染性能数据列表
+        """
+        if not batch:
+            return
+        
+        # 锁外预聚合
+        successful = 0
+        total_time = 0.0
+        total_memory = 0
+        batch_mean = 0.0
+        batch_m2 = 0.0
+        type_agg = defaultdict(_new_group_stats)
+        lib_agg = defaultdict(_new_group_stats)
+        for performance_data in batch:
+            type_stats = type_agg[performance_data.chart_type]
+            lib_stats = lib_agg[performance_data.library]
             type_stats['count'] += 1
+            lib_stats['count'] += 1
             if performance_data.success:
+                successful += 1
+                total_time += performance_data.render_time
+                total_memory += performance_data.memory_usage
+                delta = performance_data.render_time - batch_mean
+                batch_mean += delta / successful
+                batch_m2 += delta * (performance_data.render_time - batch_mean)
                 type_stats['total_time'] += performance_data.render_time
                 type_stats['total_memory'] += performance_data.memory_usage
-                type_stats['avg_time'] = type_stats['total_time'] / type_stats['count']
-                type_stats['avg_memory'] = type_stats['total_memory'] / type_stats['count']
-            
-            # 更新按库统计
-            lib_stats = self.stats_by_library[performance_data.library]
-            lib_stats['count'] += 1
-            if performance_data.success:
                 lib_stats['total_time'] += performance_data.render_time
                 lib_stats['total_memory'] += performance_data.memory_usage
-                lib_stats['avg_time'] = lib_stats['total_time'] / lib_stats['count']
-                lib_stats['avg_memory'] = lib_stats['total_memory'] / lib_stats['count']
+        
+        with self._lock.gen_wlock():
+            for performance_data in batch:
+                self._append_render(performance_data)
+            self.current_stats['total_render_time'] += total_time
+            self.current_stats['total_memory_usage'] += total_memory
+            self._merge_render_time_moments(successful, batch_mean, batch_m2)
+            # 计数与历史记录、累计值在同一写锁内更新，读者不会看到不一致的快照
+            self._total_renders.add(len(batch))
+            self._successful_renders.add(successful)
+            self._failed_renders.add(len(batch) - successful)
+        
+        # 合并到当前线程的分片
+        shard = self._get_stat_shard()
+        for kind, agg in (('type', type_agg), ('library', lib_agg)):
+            for key, stats in agg.items():
+                self._add_group_stats(shard, kind, key, stats['count'],
+                                      stats['total_time'], stats['total_memory'])
     
     def record_cache_hit(self):
         """记录缓存命中"""
-        with self._lock:
-            self.current_stats['cache_hits'] += 1
-        self.record_metric('cache_hit', 1, 'count')
+        self._cache_hits.increment()
+        if self.enable_detailed_cache_tracing:
+            self.record_metric('cache_hit', 1, 'count')
     
     def record_cache_miss(self):
         """记录缓存未命中"""
-        with self._lock:
-            self.current_stats['cache_misses'] += 1
-        self.record_metric('cache_miss', 1, 'count')
+        self._cache_misses.increment()
+        if self.enable_detailed_cache_tracing:
+            self.record_metric('cache_miss', 1, 'count')
     
     def get_current_stats(self) -> Dict[str, Any]:
         """获取当前统计信息
@@ -263,35 +736,47 @@ class PerformanceMonitor:
         Returns:
             Dict[str, Any]: 统计信息字典
         """
-        with self._lock:
-            stats = self.current_stats.copy()
+        # 计数器无需加锁即可读取
+        stats = {
+            'total_renders': self._total_renders.value,
+            'successful_renders': self._successful_renders.value,
+            'failed_renders': self._failed_renders.value,
+        }
+        with self._lock.gen_rlock():
+            stats.update(self.current_stats)
+            rt_n, rt_m2 = self._rt_n, self._rt_m2
+        stats['cache_hits'] = self._cache_hits.value
+        stats['cache_misses'] = self._cache_misses.value
+        
+        # 计算派生指标（在锁外进行，缩短临界区）
+        total_renders = stats['total_renders']
+        if total_renders > 0:
+            stats['success_rate'] = stats['successful_renders'] / total_renders
+            stats['failure_rate'] = stats['failed_renders'] / total_renders
             
-            # 计算派生指标
-            total_renders = stats['total_renders']
-            if total_renders > 0:
-                stats['success_rate'] = stats['successful_renders'] / total_renders
-                stats['failure_rate'] = stats['failed_renders'] / total_renders
-                
-                if stats['successful_renders'] > 0:
-                    stats['avg_render_time'] = stats['total_render_time'] / stats['successful_renders']
-                    stats['avg_memory_usage'] = stats['total_memory_usage'] / stats['successful_renders']
-                else:
-                    stats['avg_render_time'] = 0.0
-                    stats['avg_memory_usage'] = 0
+            if stats['successful_renders'] > 0:
+                stats['avg_render_time'] = stats['total_render_time'] / stats['successful_renders']
+                stats['avg_memory_usage'] = stats['total_memory_usage'] / stats['successful_renders']
             else:
-                stats['success_rate'] = 0.0
-                stats['failure_rate'] = 0.0
                 stats['avg_render_time'] = 0.0
                 stats['avg_memory_usage'] = 0
-            
-            # 缓存命中率
-            total_cache_requests = stats['cache_hits'] + stats['cache_misses']
-            if total_cache_requests > 0:
-                stats['cache_hit_rate'] = stats['cache_hits'] / total_cache_requests
-            else:
-                stats['cache_hit_rate'] = 0.0
-            
-            return stats
+        else:
+            stats['success_rate'] = 0.0
+            stats['failure_rate'] = 0.0
+            stats['avg_render_time'] = 0.0
+            stats['avg_memory_usage'] = 0
+        
+        # 渲染耗时标准差由写入时维护的 Welford 累积量直接得出
+        stats['render_time_stdev'] = math.sqrt(rt_m2 / (rt_n - 1)) if rt_n > 1 else 0.0
+        
+        # 缓存命中率
+        total_cache_requests = stats['cache_hits'] + stats['cache_misses']
+        if total_cache_requests > 0:
+            stats['cache_hit_rate'] = stats['cache_hits'] / total_cache_requests
+        else:
+            stats['cache_hit_rate'] = 0.0
+        
+        return stats
     
     def get_stats_by_type(self) -> Dict[str, Dict[str, Any]]:
         """获取按图表类型分组的统计信息
@@ -299,8 +784,7 @@ class PerformanceMonitor:
         Returns:
             Dict[str, Dict[str, Any]]: 按类型分组的统计信息
         """
-        with self._lock:
-            return dict(self.stats_by_type)
+        return self._merge_stat_shards('type')
     
     def get_stats_by_library(self) -> Dict[str, Dict[str, Any]]:
         """获取按库分组的统计信息
@@ -308,8 +792,7 @@ class PerformanceMonitor:
         Returns:
             Dict[str, Dict[str, Any]]: 按库分组的统计信息
         """
-        with self._lock:
-            return dict(self.stats_by_library)
+        return self._merge_stat_shards('library')
     
     def get_recent_metrics(self, metric_name: str = None, limit: int = 100) -> List[PerformanceMetric]:
         """获取最近的性能指标
@@ -321,13 +804,20 @@ class PerformanceMonitor:
         Returns:
             List[PerformanceMetric]: 性能指标列表
         """
-        with self._lock:
-            metrics = list(self.metrics_history)
-        
-        if metric_name:
-            metrics = [m for m in metrics if m.metric_name == metric_name]
-        
-        return metrics[-limit:] if limit else metrics
+        with self._lock.gen_rlock():
+            if metric_name:
+                # 从最新记录往回筛选，凑够 limit 条即停止
+                matches = (m for m in reversed(self.metrics_history) if m.metric_name == metric_name)
+                metrics = list(itertools.islice(matches, limit or None))
+                metrics.reverse()
+            else:
+                metrics = self.metrics_history.tail(limit)
+            
+            # 历史中的指标对象会被对象池复用，对外返回副本
+            return [
+                PerformanceMetric(m.timestamp, m.metric_name, m.value, m.unit, m.tags)
+                for m in metrics
+            ]
     
     def get_recent_renders(self, limit: int = 100) -> List[RenderPerformance]:
         """获取最近的渲染性能记录
@@ -338,10 +828,8 @@ class PerformanceMonitor:
         Returns:
             List[RenderPerformance]: 渲染性能记录列表
         """
-        with self._lock:
-            renders = list(self.render_history)
-        
-        return renders[-limit:] if limit else renders
+        with self._lock.gen_rlock():
+            return self.render_history.tail(limit)
     
     def get_system_metrics(self, limit: int = 100) -> List[Dict[str, Any]]:
         """获取系统资源指标
@@ -352,10 +840,8 @@ class PerformanceMonitor:
         Returns:
             List[Dict[str, Any]]: 系统指标列表
         """
-        with self._lock:
-            metrics = list(self.system_metrics)
-        
-        return metrics[-limit:] if limit else metrics
+        with self._lock.gen_rlock():
+            return self.system_metrics.tail(limit)
     
     def analyze_performance(self, time_window: int = 3600) -> Dict[str, Any]:
         """分析性能趋势
@@ -369,12 +855,15 @@ class PerformanceMonitor:
         current_time = time.time()
         start_time = current_time - time_window
         
-        # 过滤时间窗口内的数据
-        with self._lock:
-            recent_renders = [
-                r for r in self.render_history
-                if r.timestamp >= start_time and r.success
-            ]
+        # 渲染记录按时间顺序写入时，二分定位窗口起点后只遍历窗口内的数据；
+        # 出现过乱序写入则逐条按时间戳过滤
+        with self._lock.gen_rlock():
+            history = self.render_history
+            if self._render_history_sorted:
+                start_index = history.bisect_left(start_time, key=_render_timestamp)
+                recent_renders = [r for r in history.iter_from(start_index) if r.success]
+            else:
+                recent_renders = [r for r in history if r.success and r.timestamp >= start_time]
         
         if not recent_renders:
             return {
@@ -383,42 +872,26 @@ class PerformanceMonitor:
                 'analysis': '没有足够的数据进行分析'
             }
         
-        # 计算统计指标
-        render_times = [r.render_time for r in recent_renders]
-        memory_usages = [r.memory_usage for r in recent_renders]
-        data_points = [r.data_points for r in recent_renders]
+        # 计算统计指标（向量化）
+        count = len(recent_renders)
+        render_times = np.fromiter((r.render_time for r in recent_renders), dtype=np.float64, count=count)
+        memory_usages = np.fromiter((r.memory_usage for r in recent_renders), dtype=np.int64, count=count)
+        data_points = np.fromiter((r.data_points for r in recent_renders), dtype=np.int64, count=count)
         
         analysis = {
             'time_window': time_window,
-            'total_renders': len(recent_renders),
-            'render_time': {
-                'min': min(render_times),
-                'max': max(render_times),
-                'mean': statistics.mean(render_times),
-                'median': statistics.median(render_times),
-                'stdev': statistics.stdev(render_times) if len(render_times) > 1 else 0
-            },
-            'memory_usage': {
-                'min': min(memory_usages),
-                'max': max(memory_usages),
-                'mean': statistics.mean(memory_usages),
-                'median': statistics.median(memory_usages),
-                'stdev': statistics.stdev(memory_usages) if len(memory_usages) > 1 else 0
-            },
-            'data_points': {
-                'min': min(data_points),
-                'max': max(data_points),
-                'mean': statistics.mean(data_points),
-                'median': statistics.median(data_points)
-            }
+            'total_renders': count,
+            'render_time': _describe(render_times),
+            'memory_usage': _describe(memory_usages),
+            'data_points': _describe(data_points, with_stdev=False)
         }
         
         # 性能趋势分析
-        if len(recent_renders) >= 10:
+        if count >= 10:
             # 分析渲染时间趋势
-            mid_point = len(recent_renders) // 2
-            first_half_avg = statistics.mean(render_times[:mid_point])
-            second_half_avg = statistics.mean(render_times[mid_point:])
+            mid_point = count // 2
+            first_half_avg = float(render_times[:mid_point].mean())
+            second_half_avg = float(render_times[mid_point:].mean())
             
             time_trend = 'improving' if second_half_avg < first_half_avg else 'degrading'
             analysis['trends'] = {
@@ -460,12 +933,12 @@ class PerformanceMonitor:
             disk = psutil.disk_usage('/')
             
             return {
-                'cpu_count': psutil.cpu_count(),
-                'memory_total': memory.total,
+                'cpu_count': self._cpu_count,
+                'memory_total': self._memory_total,
                 'memory_available': memory.available,
-                'disk_total': disk.total,
+                'disk_total': self._disk_total,
                 'disk_free': disk.free,
-                'python_version': f"{psutil.version_info}"
+                'python_version': _PY_VERSION
             }
         except Exception as e:
             self.logger.error(f"获取系统信息失败: {e}")
@@ -478,10 +951,18 @@ class PerformanceMonitor:
             Dict[str, Any]: 内存分析信息
         """
         try:
+            import tracemalloc
             if not tracemalloc.is_tracing():
                 return {'error': '内存分析未启用'}
             
+            # 快照开销与存活分配数成正比，最小间隔内直接复用上次结果
+            now = time.monotonic()
+            if (self._last_memory_profile is not None
+                    and now - self._last_snapshot_time < self.memory_snapshot_interval):
+                return self._last_memory_profile
+            
             snapshot = tracemalloc.take_snapshot()
+            snapshot = snapshot.filter_traces((tracemalloc.Filter(False, "<frozen *>"),))
             top_stats = snapshot.statistics('lineno')
             
             # 获取前10个内存使用最多的位置
@@ -500,6 +981,8 @@ class PerformanceMonitor:
                     'blocks': stat.count
                 })
             
+            self._last_snapshot_time = now
+            self._last_memory_profile = memory_profile
             return memory_profile
             
         except Exception as e:
@@ -520,20 +1003,30 @@ class PerformanceMonitor:
             report = self.get_performance_report()
             
             if format.lower() == 'json':
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+                if orjson is not None:
+                    # orjson 直接输出 UTF-8 字节
+                    with open(filepath, 'wb') as f:
+                        f.write(orjson.dumps(
+                            report,
+                            default=str,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                        ))
+                else:
+                    with open(filepath, 'w', encoding='utf-8') as f:
+                        json.dump(report, f, indent=2, ensure_ascii=False, default=str)
             
             elif format.lower() == 'csv':
-                import pandas as pd
-                
-                # 转换渲染历史为DataFrame
-                render_data = [r.to_dict() for r in self.get_recent_renders()]
-                if render_data:
-                    df = pd.DataFrame(render_data)
-                    df.to_csv(filepath, index=False)
-                else:
-                    # 创建空CSV
-                    pd.DataFrame().to_csv(filepath, index=False)
+                # 直接逐行写出渲染历史
+                renders = self.get_recent_renders()
+                with open(filepath, 'w', newline='', encoding='utf-8') as f:
+                    if renders:
+                        writer = csv.writer(f)
+                        writer.writerow(_RENDER_CSV_FIELDS)
+                        writer.writerows(
+                            (r.chart_type, r.library, r.data_points, r.render_time, r.memory_usage,
+                             r.file_size, r.timestamp, r.success, r.error_message)
+                            for r in renders
+                        )
             
             else:
                 raise ValueError(f"不支持的导出格式: {format}")
@@ -547,32 +1040,35 @@ class PerformanceMonitor:
     
     def clear_history(self):
         """清除历史记录"""
-        with self._lock:
+        with self._lock.gen_wlock():
             self.metrics_history.clear()
             self.render_history.clear()
+            self._render_history_sorted = True
             self.system_metrics.clear()
             
             # 重置统计
+            self._reset_counters()
             self.current_stats = {
-                'total_renders': 0,
-                'successful_renders': 0,
-                'failed_renders': 0,
                 'total_render_time': 0.0,
-                'total_memory_usage': 0,
-                'cache_hits': 0,
-                'cache_misses': 0
+                'total_memory_usage': 0
             }
-            
-            self.stats_by_type.clear()
-            self.stats_by_library.clear()
+            self._reset_render_time_moments()
+        
+        # 丢弃所有分片和基础汇总，各线程下次写入时重新创建分片
+        with self._shard_lock:
+            self._stat_shards = []
+            self._stat_base = {'type': [], 'library': []}
+            self._shard_generation += 1
         
         self.logger.info("性能监控历史记录已清除")
     
     def __del__(self):
         """析构函数"""
         self.stop_system_monitoring()
-        if self.enable_memory_profiling and tracemalloc.is_tracing():
-            tracemalloc.stop()
+        if self.enable_memory_profiling:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
 
 
 def performance_timer(monitor: PerformanceMonitor = None):
@@ -587,8 +1083,10 @@ def performance_timer(monitor: PerformanceMonitor = None):
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
-            start_memory = psutil.Process().memory_info().rss
+            # 仅在启用内存分析时采样内存，避免每次调用都读取进程信息
+            sample_memory = monitor is not None and monitor.enable_memory_profiling
+            start_time = time.perf_counter_ns()
+            start_memory = _PROCESS.memory_info().rss if sample_memory else 0
             
             try:
                 result = func(*args, **kwargs)
@@ -600,11 +1098,8 @@ def performance_timer(monitor: PerformanceMonitor = None):
                 error_msg = str(e)
                 raise
             finally:
-                end_time = time.time()
-                end_memory = psutil.Process().memory_info().rss
-                
-                render_time = (end_time - start_time) * 1000  # 转换为毫秒
-                memory_usage = end_memory - start_memory
+                end_time = time.perf_counter_ns()
+                render_time = (end_time - start_time) / 1e6  # 纳秒转换为毫秒
                 
                 if monitor:
                     # 记录性能指标
@@ -615,12 +1110,14 @@ def performance_timer(monitor: PerformanceMonitor = None):
                         {'function': func.__name__}
                     )
                     
-                    monitor.record_metric(
-                        f"function_{func.__name__}_memory",
-                        memory_usage,
-                        "bytes",
-                        {'function': func.__name__}
-                    )
+                    if sample_memory:
+                        memory_usage = _PROCESS.memory_info().rss - start_memory
+                        monitor.record_metric(
+                            f"function_{func.__name__}_memory",
+                            memory_usage,
+                            "bytes",
+                            {'function': func.__name__}
+                        )
             
             return result
         
@@ -630,6 +1127,7 @@ def performance_timer(monitor: PerformanceMonitor = None):
 
 # 全局性能监控器实例
 _global_performance_monitor = None
+_global_performance_monitor_lock = threading.Lock()
 
 
 def get_performance_monitor() -> PerformanceMonitor:
@@ -639,9 +1137,15 @@ def get_performance_monitor() -> PerformanceMonitor:
         PerformanceMonitor: 性能监控器实例
     """
     global _global_performance_monitor
-    if _global_performance_monitor is None:
-        _global_performance_monitor = PerformanceMonitor()
-    return _global_performance_monitor
+    # 快速路径：已初始化时无需加锁
+    monitor = _global_performance_monitor
+    if monitor is not None:
+        return monitor
+    
+    with _global_performance_monitor_lock:
+        if _global_performance_monitor is None:
+            _global_performance_monitor = PerformanceMonitor()
+        return _global_performance_monitor
 
 
 # 为了兼容性，提供别名
@@ -651,7 +1155,8 @@ get_global_monitor = get_performance_monitor
 def reset_global_monitor():
     """重置全局性能监控器实例"""
     global _global_performance_monitor
-    _global_performance_monitor = None
+    with _global_performance_monitor_lock:
+        _global_performance_monitor = None
 
 
 def set_global_monitor(monitor: PerformanceMonitor):
@@ -661,7 +1166,8 @@ def set_global_monitor(monitor: PerformanceMonitor):
         monitor: 性能监控器实例
     """
     global _global_performance_monitor
-    _global_performance_monitor = monitor
+    with _global_performance_monitor_lock:
+        _global_performance_monitor = monitor
 
 
 def start_monitoring(interval: float = 5.0):
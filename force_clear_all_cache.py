@@ -5,40 +5,279 @@
 解决用户仍看到60秒超时错误的问题
 """
 
+import io
 import os
+import re
 import sys
+import mmap
+import random
+import hashlib
 import time
 import shutil
+import tempfile
 import subprocess
 from pathlib import Path
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# 超时检查关注的标记，编译为一个字节正则，单次扫描即可得到全部命中
+TIMEOUT_TOKENS = ("timeout=180", "AI分析请求超时（180秒）", "60秒")
+_TIMEOUT_PATTERN = re.compile(b"|".join(re.escape(token.encode("utf-8")) for token in TIMEOUT_TOKENS))
+# 标记对应的位标志，扫描结果折叠为一个整数后用位运算判断
+F_T180 = 1
+F_MSG = 2
+F_60S = 4
+_TOKEN_FLAGS = dict(zip(TIMEOUT_TOKENS, (F_T180, F_MSG, F_60S)))
+
+# 前端检查表：(关注的位, 期望值, 通过提示, 失败提示)
+_FRONTEND_CHECKS = (
+    (F_T180 | F_MSG, F_T180 | F_MSG, "   ✅ 前端超时设置正确 (180秒)", "   ❌ 前端超时设置异常"),
+    (F_60S, 0, "   ✅ 前端代码中无60秒引用", "   ⚠️ 前端代码中仍有60秒引用"),
+)
+
+# 每个标记都包含其中之一的字节片段，两者都不存在时可跳过正则扫描
+_TIMEOUT_PREFILTER = (b"timeout=", "秒".encode("utf-8"))
+
+# 需要从sys.modules中卸载的模块名关键字
+_RELOAD_MODULE_PATTERN = re.compile(r"frontend|backend|app", re.IGNORECASE)
+
+# 前端代码中的缓存破坏注释行
+_CACHE_BUSTER_PATTERN = re.compile(rb"(?m)^# Cache Buster: \d+")
+
+@contextmanager
+def _mmap_bytes(path):
+    """只读内存映射文件，空文件返回空字节串"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+# 记录上次写入后前端代码内容哈希的文件
+CACHE_BUSTER_HASH_FILE = os.path.join(".streamlit", ".cache_buster.hash")
+
+# 后端健康检查地址
+HEALTH_URL = "http://localhost:7701/api/health"
+
+# 本项目的服务入口脚本，只终止运行这些脚本的进程
+PROJECT_ROOT = Path(__file__).resolve().parent
+SERVICE_SCRIPTS = frozenset(str(PROJECT_ROOT / script) for script in (
+    "start.py",
+    os.path.join("backend", "app.py"),
+    os.path.join("frontend", "app.py"),
+))
+
+class Section:
+    """按步骤缓冲输出，退出时一次性写入stdout"""
+    
+    def __init__(self, title):
+        self._buf = io.StringIO()
+        self.log(title)
+    
+    def log(self, msg=""):
+        self._buf.write(f"{msg}\n")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        sys.stdout.write(self._buf.getvalue())
+        sys.stdout.flush()
+        return False
+
+# 复用的HTTP会话（首次使用时创建）：一次性探测用带重试的会话，就绪轮询用不重试的会话
+_SESSION = None
+_POLL_SESSION = None
+
+def _new_session(max_retries):
+    """创建带连接池的HTTP会话"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=max_retries)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def _get_poll_session():
+    """获取不做任何重试的HTTP会话，供就绪轮询使用，由轮询自身控制间隔和截止时间"""
+    global _POLL_SESSION
+    if _POLL_SESSION is None:
+        from urllib3.util.retry import Retry
+        _POLL_SESSION = _new_session(Retry(total=0, connect=0, read=0, redirect=0, status=0))
+    return _POLL_SESSION
+
+def _get_session():
+    """获取带连接池和重试策略的HTTP会话"""
+    global _SESSION
+    if _SESSION is None:
+        from urllib3.util.retry import Retry
+        
+        class _JitterRetry(Retry):
+            """指数退避基础上增加±15%随机抖动，避免多次探测同步重试"""
+            
+            def get_backoff_time(self):
+                return super().get_backoff_time() * random.uniform(0.85, 1.15)
+        
+        # 只重试幂等的GET请求，POST等非幂等请求不重试
+        retry = _JitterRetry(total=5, backoff_factor=0.3,
+                             status_forcelist=[502, 503, 504],
+                             allowed_methods=frozenset(["GET"]))
+        _SESSION = _new_session(retry)
+    return _SESSION
+
+# 扫描结果缓存：路径 -> ((st_mtime_ns, st_size), 命中标记集合)，按访问次数淘汰
+_SCAN_CACHE_SIZE = 128
+_SCAN_CACHE = {}
+_SCAN_HITS = Counter()
+
+def _scan(path):
+    """单次扫描文件，返回其中出现的超时标记集合（文件未变化时直接返回缓存结果）"""
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    _SCAN_HITS[path] += 1
+    
+    cached = _SCAN_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return set(cached[1])
+    
+    with _mmap_bytes(path) as data:
+        hits = _scan_bytes(data)
+    
+    _store_scan(path, key, hits)
+    return hits
+
+def _scan_bytes(data):
+    """在字节内容中查找超时标记"""
+    if any(data.find(marker) != -1 for marker in _TIMEOUT_PREFILTER):
+        return {m.group(0).decode("utf-8") for m in _TIMEOUT_PATTERN.finditer(data)}
+    return set()
+
+def _store_scan(path, key, hits):
+    """写入扫描缓存，超出容量时淘汰访问次数最少的条目"""
+    if path not in _SCAN_CACHE and len(_SCAN_CACHE) >= _SCAN_CACHE_SIZE:
+        victim = min(_SCAN_CACHE, key=_SCAN_HITS.__getitem__)
+        del _SCAN_CACHE[victim]
+        del _SCAN_HITS[victim]
+    _SCAN_CACHE[path] = (key, frozenset(hits))
+
+def _prime_scan(path, data):
+    """用刚写入的内容预填扫描缓存，后续验证无需重新读取文件"""
+    st = os.stat(path)
+    _store_scan(path, (st.st_mtime_ns, st.st_size), _scan_bytes(data))
+
+def _scan_flags(path):
+    """扫描文件并把命中的标记折叠为位标志"""
+    flags = 0
+    for token in _scan(path):
+        flags |= _TOKEN_FLAGS[token]
+    return flags
+
+def _wait_ready(url, timeout_s=30):
+    """轮询健康检查地址直到返回200，指数退避，超时返回False"""
+    deadline = time.monotonic() + timeout_s
+    delay = 0.1
+    session = _get_poll_session()
+    while time.monotonic() < deadline:
+        try:
+            # 单次请求的超时不超过剩余时间，保证整体不超出截止时间
+            request_timeout = min(2.0, max(0.1, deadline - time.monotonic()))
+            if session.get(url, timeout=request_timeout).status_code == 200:
+                return True
+        except Exception:
+            pass
+        time.sleep(min(delay, max(0, deadline - time.monotonic())))
+        delay = min(delay * 2, 2.0)
+    return False
 
 def kill_all_processes():
-    """终止所有相关进程"""
+    """终止所有相关进程，taskkill超时未能完成时返回False"""
     print("🔄 终止所有相关进程...")
     
-    # 终止Python进程
-    try:
-        subprocess.run(["taskkill", "/f", "/im", "python.exe"], 
-                      capture_output=True, text=True)
-        print("   ✅ 已终止所有Python进程")
-    except:
-        print("   ⚠️ 无法终止Python进程")
+    # 先记录目标进程，终止后等待它们实际退出，而不是固定休眠
+    procs = _find_service_processes()
     
-    # 终止Streamlit进程
+    if os.name != "nt":
+        if procs is None:
+            print("   ⚠️ 未安装psutil，无法终止相关进程")
+            return True
+        for proc in procs:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+    else:
+        # 一次taskkill同时终止Python和Streamlit进程，输出不需要，直接丢弃；
+        # 超时视为失败，改用 /T 连同子进程一起终止后重试一次
+        attempts = (["/f"], ["/f", "/t"])
+        for i, flags in enumerate(attempts):
+            try:
+                p = subprocess.Popen(["taskkill", *flags, "/im", "python.exe", "/im", "streamlit.exe"],
+                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except Exception:
+                print("   ⚠️ 无法终止Python和Streamlit进程")
+                return True
+            try:
+                p.wait(timeout=5)
+                break
+            except subprocess.TimeoutExpired:
+                p.kill()
+                if i + 1 < len(attempts):
+                    print("   ⚠️ taskkill超时，使用 /F /T 重试...")
+                else:
+                    print("   ❌ taskkill超时，目标进程可能仍在运行，停止后续步骤")
+                    return False
+    
+    if procs is None:
+        # 没有psutil时无法跟踪进程，退回固定等待
+        time.sleep(3)
+        print("   ✅ 已终止所有Python和Streamlit进程")
+        return True
+    
+    import psutil
+    _, alive = psutil.wait_procs(procs, timeout=5)
+    print(f"   ✅ 已终止 {len(procs) - len(alive)} 个服务进程")
+    if alive:
+        print(f"   ⚠️ 仍有 {len(alive)} 个进程未退出")
+    return True
+
+def _find_service_processes():
+    """查找运行本项目服务入口脚本的进程（跳过当前进程），未安装psutil时返回None
+    
+    命令行中的.py参数按进程工作目录解析为绝对路径后与SERVICE_SCRIPTS比较，
+    覆盖 python start.py、python app.py（backend目录）和 streamlit run app.py（frontend目录）
+    """
     try:
-        subprocess.run(["taskkill", "/f", "/im", "streamlit.exe"], 
-                      capture_output=True, text=True)
-        print("   ✅ 已终止Streamlit进程")
-    except:
-        print("   ⚠️ 无法终止Streamlit进程")
+        import psutil
+    except ImportError:
+        return None
     
-    # 等待进程完全终止
-    time.sleep(3)
+    current_pid = os.getpid()
+    procs = []
+    for proc in psutil.process_iter(["cmdline", "cwd"]):
+        if proc.pid == current_pid:
+            continue
+        cmdline = proc.info["cmdline"] or []
+        cwd = proc.info["cwd"]
+        if not cwd:
+            # 无权限读取工作目录的进程不属于本项目服务
+            continue
+        for arg in cmdline[1:]:
+            if arg.endswith(".py") and os.path.realpath(os.path.join(cwd, arg)) in SERVICE_SCRIPTS:
+                procs.append(proc)
+                break
+    return procs
 
 def clear_streamlit_cache():
     """清除Streamlit缓存"""
-    print("\n🧹 清除Streamlit缓存...")
-    
+    with Section("\n🧹 清除Streamlit缓存...") as section:
+        _rm_streamlit_caches(section.log)
+
+def _rm_streamlit_caches(log):
+    """删除Streamlit及测试相关缓存目录"""
     # Streamlit缓存目录
     cache_dirs = [
         os.path.expanduser("~/.streamlit"),
@@ -53,79 +292,134 @@ def clear_streamlit_cache():
             try:
                 if os.path.isdir(cache_dir):
                     shutil.rmtree(cache_dir)
-                    print(f"   ✅ 已删除缓存目录: {cache_dir}")
+                    log(f"   ✅ 已删除缓存目录: {cache_dir}")
                 else:
                     os.remove(cache_dir)
-                    print(f"   ✅ 已删除缓存文件: {cache_dir}")
+                    log(f"   ✅ 已删除缓存文件: {cache_dir}")
             except Exception as e:
-                print(f"   ⚠️ 无法删除 {cache_dir}: {e}")
+                log(f"   ⚠️ 无法删除 {cache_dir}: {e}")
         else:
-            print(f"   ℹ️ 缓存目录不存在: {cache_dir}")
+            log(f"   ℹ️ 缓存目录不存在: {cache_dir}")
+
+def _find_caches(root):
+    """用os.scandir单次遍历，收集__pycache__目录和.pyc文件"""
+    cache_dirs = []
+    pyc_files = []
+    pending = [root]
+    
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    # DirEntry自带文件类型，无需额外stat
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name == "__pycache__":
+                            cache_dirs.append(entry.path)
+                        else:
+                            pending.append(entry.path)
+                    elif entry.name.endswith(".pyc"):
+                        pyc_files.append(entry.path)
+        except OSError:
+            continue
+    
+    return cache_dirs, pyc_files
+
+def _rm_cache_path(path):
+    """删除单个缓存目录或文件，返回异常（成功时为None）"""
+    try:
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    except Exception as e:
+        return e
+    return None
+
+def _rm_caches(root, log=print):
+    """删除root下所有__pycache__目录和.pyc文件"""
+    # 遍历结束、目录句柄关闭后再删除，避免Windows上目录占用问题
+    cache_dirs, pyc_files = _find_caches(root)
+    paths = cache_dirs + pyc_files
+    if not paths:
+        return
+    
+    # 删除以文件系统调用为主，用小线程池重叠IO等待；结果回到主线程按顺序输出
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+        errors = list(executor.map(_rm_cache_path, paths))
+    
+    for path, error in zip(paths, errors):
+        if error is None:
+            log(f"   ✅ 已删除: {path}")
+        else:
+            log(f"   ⚠️ 无法删除 {path}: {error}")
 
 def clear_python_cache():
     """清除Python缓存"""
-    print("\n🐍 清除Python缓存...")
-    
-    # 递归删除所有__pycache__目录
-    for root, dirs, files in os.walk("."):
-        for dir_name in dirs[:]:
-            if dir_name == "__pycache__":
-                cache_path = os.path.join(root, dir_name)
-                try:
-                    shutil.rmtree(cache_path)
-                    print(f"   ✅ 已删除: {cache_path}")
-                    dirs.remove(dir_name)
-                except Exception as e:
-                    print(f"   ⚠️ 无法删除 {cache_path}: {e}")
+    with Section("\n🐍 清除Python缓存...") as section:
+        _rm_caches(".", section.log)
+
+def _read_cache_buster_hash():
+    """读取上次写入后的前端代码哈希，不存在时返回None"""
+    try:
+        with open(CACHE_BUSTER_HASH_FILE, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _write_cache_buster_hash(content_hash):
+    """保存前端代码哈希"""
+    os.makedirs(os.path.dirname(CACHE_BUSTER_HASH_FILE), exist_ok=True)
+    with open(CACHE_BUSTER_HASH_FILE, "w", encoding="utf-8") as f:
+        f.write(content_hash)
+
+def update_cache_buster(force=False):
+    """更新缓存破坏机制
     
-    # 删除.pyc文件
-    for root, dirs, files in os.walk("."):
-        for file_name in files:
-            if file_name.endswith(".pyc"):
-                file_path = os.path.join(root, file_name)
-                try:
-                    os.remove(file_path)
-                    print(f"   ✅ 已删除: {file_path}")
-                except Exception as e:
-                    print(f"   ⚠️ 无法删除 {file_path}: {e}")
-
-def update_cache_buster():
-    """更新缓存破坏机制"""
+    force=True 时总是写入新的时间戳（强制清理流程使用）；
+    否则前端代码自上次写入后未变化时跳过重写
+    """
     print("\n🔄 更新缓存破坏机制...")
     
     # 在前端代码中添加时间戳
     frontend_file = "frontend/app.py"
     
     try:
-        with open(frontend_file, "r", encoding="utf-8") as f:
-            content = f.read()
-        
         # 添加或更新缓存破坏时间戳
-        import time
         timestamp = int(time.time())
         
         # 在文件开头添加时间戳注释
         cache_buster = f"# Cache Buster: {timestamp}\n"
         
-        # 如果已存在缓存破坏注释，替换它
-        lines = content.split('\n')
-        new_lines = []
-        found_cache_buster = False
-        
-        for line in lines:
-            if line.startswith("# Cache Buster:"):
-                new_lines.append(cache_buster.strip())
-                found_cache_buster = True
-            else:
-                new_lines.append(line)
-        
-        # 如果没有找到缓存破坏注释，在文件开头添加
-        if not found_cache_buster:
-            new_lines.insert(0, cache_buster.strip())
+        # 时间戳未变化时无需解码和重写文件
+        with _mmap_bytes(frontend_file) as data:
+            if data.find(cache_buster.encode("utf-8")) != -1:
+                print(f"   ✅ 缓存破坏时间戳已是最新: {timestamp}")
+                return
+            
+            # 内容与上次写入后一致时跳过重写
+            content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+            if not force and content_hash == _read_cache_buster_hash():
+                print("   ✅ 前端代码自上次更新后未变化，跳过重写")
+                return
+            
+            # 如果已存在缓存破坏注释，替换它；否则在文件开头添加
+            new_content, found = _CACHE_BUSTER_PATTERN.subn(
+                cache_buster.strip().encode("utf-8"), data, count=1
+            )
+            if not found:
+                new_content = cache_buster.encode("utf-8") + data[:]
         
-        # 写回文件
-        with open(frontend_file, "w", encoding="utf-8") as f:
-            f.write('\n'.join(new_lines))
+        # 先写临时文件再替换，避免写入中断损坏前端代码
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(frontend_file), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(new_content)
+            os.replace(tmp_path, frontend_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        _write_cache_buster_hash(hashlib.blake2b(new_content, digest_size=16).hexdigest())
+        _prime_scan(frontend_file, new_content)
         
         print(f"   ✅ 已更新缓存破坏时间戳: {timestamp}")
         
@@ -137,10 +431,7 @@ def force_reload_modules():
     print("\n🔄 强制重新加载模块...")
     
     # 清除sys.modules中的相关模块
-    modules_to_remove = []
-    for module_name in sys.modules.keys():
-        if any(keyword in module_name.lower() for keyword in ['frontend', 'backend', 'app']):
-            modules_to_remove.append(module_name)
+    modules_to_remove = [name for name in list(sys.modules) if _RELOAD_MODULE_PATTERN.search(name)]
     
     for module_name in modules_to_remove:
         try:
@@ -153,10 +444,6 @@ def restart_services():
     """重启服务"""
     print("\n🚀 重启服务...")
     
-    # 等待一段时间确保所有进程完全终止
-    print("   ⏳ 等待进程完全终止...")
-    time.sleep(5)
-    
     # 启动服务
     try:
         print("   🚀 启动新的服务实例...")
@@ -167,8 +454,9 @@ def restart_services():
             text=True
         )
         
-        # 等待服务启动
-        time.sleep(10)
+        # 等待服务启动（就绪即返回）
+        if not _wait_ready(HEALTH_URL, timeout_s=30):
+            print("   ⚠️ 等待服务就绪超时")
         
         print("   ✅ 服务已重新启动")
         print("   📊 前端地址: http://localhost:8504")
@@ -184,15 +472,13 @@ def verify_fix():
     """验证修复效果"""
     print("\n🔍 验证修复效果...")
     
-    import requests
-    
     # 等待服务完全启动
     print("   ⏳ 等待服务完全启动...")
-    time.sleep(15)
+    _wait_ready(HEALTH_URL, timeout_s=30)
     
     # 测试后端健康状态
     try:
-        response = requests.get("http://localhost:7701/api/health", timeout=10)
+        response = _get_session().get(HEALTH_URL, timeout=10)
         if response.status_code == 200:
             print("   ✅ 后端服务正常")
         else:
@@ -204,20 +490,14 @@ def verify_fix():
     
     # 检查前端代码中的超时设置
     try:
-        with open("frontend/app.py", "r", encoding="utf-8") as f:
-            content = f.read()
+        flags = _scan_flags("frontend/app.py")
         
-        if "timeout=180" in content and "AI分析请求超时（180秒）" in content:
-            print("   ✅ 前端超时设置正确 (180秒)")
-        else:
-            print("   ❌ 前端超时设置异常")
-            return False
-            
-        if "60秒" in content:
-            print("   ⚠️ 前端代码中仍有60秒引用")
-            return False
-        else:
-            print("   ✅ 前端代码中无60秒引用")
+        for mask, expected, ok_msg, fail_msg in _FRONTEND_CHECKS:
+            if flags & mask == expected:
+                print(ok_msg)
+            else:
+                print(fail_msg)
+                return False
             
     except Exception as e:
         print(f"   ❌ 检查前端代码失败: {e}")
@@ -227,44 +507,45 @@ def verify_fix():
 
 def show_user_instructions():
     """显示用户操作说明"""
-    print("\n" + "="*60)
-    print("📋 用户操作说明 - 彻底解决60秒超时问题")
-    print("="*60)
-    
-    print("\n🌐 浏览器缓存清理 (必须执行):")
-    print("   1. 打开浏览器")
-    print("   2. 按 Ctrl + Shift + Delete")
-    print("   3. 选择 '全部时间'")
-    print("   4. 勾选所有选项 (缓存、Cookie、历史记录等)")
-    print("   5. 点击 '清除数据'")
-    
-    print("\n🔄 强制刷新 (推荐):")
-    print("   1. 访问 http://localhost:8504")
-    print("   2. 按 Ctrl + F5 (强制刷新)")
-    print("   3. 或按 Ctrl + Shift + R")
-    
-    print("\n🕵️ 无痕模式测试 (验证):")
-    print("   1. 打开无痕/隐私浏览模式")
-    print("   2. 访问 http://localhost:8504")
-    print("   3. 测试AI洞察功能")
-    
-    print("\n🧪 测试步骤:")
-    print("   1. 上传数据文件")
-    print("   2. 进入AI洞察页面")
-    print("   3. 提问一个复杂问题")
-    print("   4. 观察是否还显示60秒超时错误")
-    
-    print("\n✅ 预期结果:")
-    print("   - 如果超时，应显示 '180秒' 而不是 '60秒'")
-    print("   - 错误消息应为: 'AI分析请求超时（180秒）'")
-    
-    print("\n🆘 如果问题仍然存在:")
-    print("   1. 重启计算机")
-    print("   2. 重新运行此脚本")
-    print("   3. 使用不同的浏览器测试")
-    print("   4. 检查是否有多个应用实例在运行")
-    
-    print("\n" + "="*60)
+    with Section("\n" + "="*60) as section:
+        log = section.log
+        log("📋 用户操作说明 - 彻底解决60秒超时问题")
+        log("="*60)
+        
+        log("\n🌐 浏览器缓存清理 (必须执行):")
+        log("   1. 打开浏览器")
+        log("   2. 按 Ctrl + Shift + Delete")
+        log("   3. 选择 '全部时间'")
+        log("   4. 勾选所有选项 (缓存、Cookie、历史记录等)")
+        log("   5. 点击 '清除数据'")
+        
+        log("\n🔄 强制刷新 (推荐):")
+        log("   1. 访问 http://localhost:8504")
+        log("   2. 按 Ctrl + F5 (强制刷新)")
+        log("   3. 或按 Ctrl + Shift + R")
+        
+        log("\n🕵️ 无痕模式测试 (验证):")
+        log("   1. 打开无痕/隐私浏览模式")
+        log("   2. 访问 http://localhost:8504")
+        log("   3. 测试AI洞察功能")
+        
+        log("\n🧪 测试步骤:")
+        log("   1. 上传数据文件")
+        log("   2. 进入AI洞察页面")
+        log("   3. 提问一个复杂问题")
+        log("   4. 观察是否还显示60秒超时错误")
+        
+        log("\n✅ 预期结果:")
+        log("   - 如果超时，应显示 '180秒' 而不是 '60秒'")
+        log("   - 错误消息应为: 'AI分析请求超时（180秒）'")
+        
+        log("\n🆘 如果问题仍然存在:")
+        log("   1. 重启计算机")
+        log("   2. 重新运行此脚本")
+        log("   3. 使用不同的浏览器测试")
+        log("   4. 检查是否有多个应用实例在运行")
+        
+        log("\n" + "="*60)
 
 def main():
     """主函数"""
@@ -274,14 +555,16 @@ def main():
     
     try:
         # 1. 终止所有进程
-        kill_all_processes()
+        if not kill_all_processes():
+            print("\n❌ 相关进程未能终止，已停止清理和重启")
+            return
         
         # 2. 清除各种缓存
         clear_streamlit_cache()
         clear_python_cache()
         
-        # 3. 更新缓存破坏机制
-        update_cache_buster()
+        # 3. 更新缓存破坏机制（强制刷新时间戳）
+        update_cache_buster(force=True)
         
         # 4. 强制重新加载模块
         force_reload_modules()
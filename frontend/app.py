@@ -1,31 +1,38 @@
 # Streamlit 前端应用入口
 import streamlit as st
-
-# 缓存破坏机制 - 强制刷新
-import time
 import hashlib
-
-# 生成唯一的缓存破坏标识
-CACHE_BUSTER = hashlib.md5(str(time.time()).encode()).hexdigest()[:8]
-
-# 在页面标题中添加缓存破坏标识
-if "cache_buster" not in st.session_state:
-    st.session_state.cache_buster = CACHE_BUSTER
-    # 强制重新加载页面配置
-    st.rerun()
-
 import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from io import StringIO
+from io import StringIO, BytesIO
 import base64
 from PIL import Image
 import plotly.express as px
 import plotly.graph_objects as go
 import sys
 import os
+import warnings
+import tempfile
+import pickle
+import uuid
+import functools
+from pathlib import Path
+from datetime import datetime, date, time as dtime
+from types import MappingProxyType
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -33,6 +40,21 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # 后端API配置
 BACKEND_URL = "http://localhost:5000"
 
+# 部署版本标识，用于跨部署的缓存失效（静态值，不再在首次访问时强制重跑）
+CACHE_BUSTER = os.getenv("GIT_SHA", "dev")
+
+# 复用的HTTP会话，所有后端请求共享keep-alive连接池（默认只重试幂等请求）
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                      max_retries=Retry(total=2, backoff_factor=0.1)))
+
+def _api(method, path, **kwargs):
+    """通过共享会话请求多库可视化后端接口"""
+    return _SESSION.request(method, f"{BACKEND_URL}{path}", **kwargs)
+
+# 设置 JDC_POLARS=1 且安装了polars时，图表数据的分组聚合改用polars，默认仍使用pandas
+USE_POLARS = pl is not None and os.getenv("JDC_POLARS", "0") == "1"
+
 # 页面配置
 st.set_page_config(
     page_title="JDC数据分析工具",
@@ -73,6 +95,306 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# 局部重跑装饰器：片段内的交互只重跑该片段（Streamlit 1.33+），旧版本退化为普通函数
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+def _set_page(page_name):
+    """导航按钮回调，在本次重跑开始前切换页面"""
+    st.session_state['current_page'] = page_name
+
+def _df_content_digest(df):
+    """按数据内容计算DataFrame摘要，无法逐行哈希的数据退化为序列化后哈希"""
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+    except TypeError:
+        return hashlib.blake2b(pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL), digest_size=16).hexdigest()
+
+def _df_fingerprint(df):
+    """DataFrame缓存键：内容摘要+形状+列名
+    
+    会话当前数据集的摘要在加载时算好存于session_state，重跑时直接取用；
+    其他DataFrame按内容现算，避免对象id复用导致不同数据命中同一缓存
+    """
+    if df is st.session_state.get('dataframe') and 'dataframe_digest' in st.session_state:
+        digest = st.session_state['dataframe_digest']
+    else:
+        digest = _df_content_digest(df)
+    return (digest, df.shape, tuple(df.columns))
+
+_DF_HASH_FUNCS = {pd.DataFrame: _df_fingerprint}
+
+# 按DataFrame缓存的派生统计最多保留的条目数
+DF_CACHE_MAX_ENTRIES = 8
+
+# 表格默认展示的行数，超过时只向浏览器发送部分数据
+PREVIEW_ROWS = 500
+MAX_PREVIEW_ROWS = 10_000
+
+# 上传文件写入临时文件时每次复制的字节数
+UPLOAD_CHUNK_BYTES = 1 << 20
+
+# 超过该大小的CSV分块读取，并在读取过程中显示进度
+CHUNKED_CSV_BYTES = 100 * 1024 * 1024
+CSV_CHUNK_ROWS = 256_000
+
+# Excel逐行读取时每块的行数
+EXCEL_CHUNK_ROWS = 50_000
+
+def _upload_digest(uploaded_file):
+    """上传文件内容摘要，直接在内存缓冲区上计算，不复制文件内容"""
+    return hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest()
+
+def _spool_upload(uploaded_file):
+    """把上传文件分块写入临时文件，返回路径"""
+    uploaded_file.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=Path(uploaded_file.name).suffix, delete=False) as tf:
+        for chunk in iter(lambda: uploaded_file.read(UPLOAD_CHUNK_BYTES), b''):
+            tf.write(chunk)
+    return tf.name
+
+def _temporal_column_positions(df):
+    """PyArrow引擎自动识别为日期/时间的列位置（C引擎会把这些列保留为字符串）"""
+    positions = []
+    for i, (_, column) in enumerate(df.items()):
+        if pd.api.types.is_datetime64_any_dtype(column.dtype):
+            positions.append(i)
+        elif column.dtype == object:
+            first = column.first_valid_index()
+            if first is not None and isinstance(column.at[first], (date, dtime)):
+                positions.append(i)
+    return positions
+
+def _read_csv_fast(path):
+    """优先使用PyArrow引擎解析CSV，不可用时回退到默认C引擎
+
+    PyArrow会把ISO日期列解析为日期类型，而C引擎保留为字符串；
+    这些列用C引擎按位置重新读取，保持与默认引擎一致的dtype
+    """
+    try:
+        df = pd.read_csv(path, engine="pyarrow")
+    except (ImportError, ValueError):
+        return pd.read_csv(path)
+    
+    positions = _temporal_column_positions(df)
+    if positions:
+        original = pd.read_csv(path, usecols=positions)
+        for k, i in enumerate(positions):
+            df[df.columns[i]] = original.iloc[:, k].to_numpy()
+    return df
+
+def _excel_column_names(header, width):
+    """按pandas的规则生成表头：空表头命名为Unnamed: i，重复名依次加.1、.2后缀"""
+    names = [
+        name if name is not None else f"Unnamed: {i}"
+        for i, name in enumerate(list(header) + [None] * (width - len(header)))
+    ]
+    counts = {}
+    for i, name in enumerate(names):
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[name] = count + 1
+            name = f"{name}.{count}"
+            count = counts.get(name, 0)
+        names[i] = name
+        counts[name] = count + 1
+    return names
+
+def _read_xlsx_chunked(path):
+    """以只读模式逐行读取xlsx的第一个工作表，按块构建DataFrame后合并，降低峰值内存"""
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        # 与pd.read_excel默认的sheet_name=0一致，读取第一个工作表而不是活动工作表
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        
+        chunks = []
+        block = []
+        
+        def flush():
+            # 数据行比表头长时补齐列名，各块按列名合并
+            width = max(len(header), max((len(row) for row in block), default=0))
+            chunks.append(pd.DataFrame(block, columns=_excel_column_names(header, width)))
+        
+        for row in rows:
+            block.append(row)
+            if len(block) >= EXCEL_CHUNK_ROWS:
+                flush()
+                block = []
+        if block or not chunks:
+            flush()
+        return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    finally:
+        workbook.close()
+
+def _load_csv_chunked(path, chunksize=CSV_CHUNK_ROWS):
+    """分块读取大CSV，边读边显示进度、已读取行数和首块预览"""
+    progress = st.progress(0.0)
+    status = st.empty()
+    preview = st.empty()
+    total_bytes = max(os.path.getsize(path), 1)
+    
+    chunks = []
+    rows = 0
+    with open(path, 'rb') as f:
+        for chunk in pd.read_csv(f, chunksize=chunksize):
+            chunks.append(chunk)
+            rows += len(chunk)
+            progress.progress(min(f.tell() / total_bytes, 1.0))
+            status.caption(f"已读取 {rows:,} 行...")
+            if len(chunks) == 1:
+                preview.dataframe(chunk.head(10), use_container_width=True)
+    
+    progress.empty()
+    status.empty()
+    preview.empty()
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_df(_path, digest, name, fast_io=True):
+    """从临时文件解析上传数据，按内容摘要缓存（_path不参与缓存键）"""
+    if name.endswith('.csv'):
+        return _read_csv_fast(_path) if fast_io else pd.read_csv(_path)
+    if fast_io and name.endswith('.xlsx'):
+        try:
+            return _read_xlsx_chunked(_path)
+        except ImportError:
+            pass
+    return pd.read_excel(_path)
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS, max_entries=DF_CACHE_MAX_ENTRIES)
+def _missing(df):
+    """各列缺失值数量，在布尔数组上按列一次求和"""
+    return pd.Series(df.isnull().to_numpy().sum(axis=0), index=df.columns)
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS, max_entries=DF_CACHE_MAX_ENTRIES)
+def _total_missing(df):
+    """缺失值总数，直接汇总已缓存的各列缺失数，不再重新扫描数据"""
+    return int(_missing(df).to_numpy().sum())
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS, max_entries=DF_CACHE_MAX_ENTRIES)
+def _overview_stats(df):
+    """数据概览卡片指标：(总行数, 总列数, 数值列数, 缺失值百分比)"""
+    rows, cols = df.shape
+    cells = rows * cols
+    missing_pct = _total_missing(df) / cells * 100 if cells else 0.0
+    return rows, cols, len(_col_kinds(df)['numeric']), missing_pct
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS, max_entries=DF_CACHE_MAX_ENTRIES)
+def _dup_count(df):
+    """重复行数：对每行计算64位哈希后统计重复的哈希值"""
+    if df.empty:
+        return 0
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return int(len(row_hashes) - len(np.unique(row_hashes)))
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS, max_entries=DF_CACHE_MAX_ENTRIES)
+def _mem_mb(df):
+    """DataFrame深度内存占用（MB），需要遍历object列，只计算一次"""
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS, max_entries=DF_CACHE_MAX_ENTRIES)
+def _col_kinds(df):
+    """按类型划分的列名：数值列、object列、分类列(object/category)
+    
+    直接遍历df.dtypes一次完成划分，判断规则与select_dtypes一致，但不构造切片DataFrame
+    """
+    numeric, objects, categorical = [], [], []
+    for col, dtype in df.dtypes.items():
+        if issubclass(dtype.type, np.number) or (
+                getattr(dtype, '_is_numeric', False) and not pd.api.types.is_bool_dtype(dtype)):
+            numeric.append(col)
+        elif issubclass(dtype.type, np.object_):
+            objects.append(col)
+            categorical.append(col)
+        elif isinstance(dtype, pd.CategoricalDtype):
+            categorical.append(col)
+    return {
+        'numeric': tuple(numeric),
+        'object': tuple(objects),
+        'categorical': tuple(categorical),
+    }
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS, max_entries=DF_CACHE_MAX_ENTRIES)
+def _data_context(df):
+    """AI问答附带的数据上下文，数据不变时各次提问复用"""
+    kinds = _col_kinds(df)
+    return {
+        'shape': list(df.shape),
+        'columns': df.columns.tolist(),
+        'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()},
+        'missing_values': dict(zip(df.columns, _missing(df).tolist())),
+        'numeric_columns': list(kinds['numeric']),
+        'categorical_columns': list(kinds['object'])
+    }
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS, max_entries=DF_CACHE_MAX_ENTRIES)
+def _column_info(df):
+    """图表推荐用的逐列特征：类型、唯一值数量、缺失值数量"""
+    unique_counts = df.nunique().to_numpy()
+    null_counts = _missing(df).to_numpy()
+    return {
+        col: {
+            'type': str(dtype),
+            'unique_values': int(unique),
+            'null_count': int(nulls)
+        } for col, dtype, unique, nulls in zip(df.columns, df.dtypes, unique_counts, null_counts)
+    }
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS, max_entries=DF_CACHE_MAX_ENTRIES)
+def _quartiles(df):
+    """所有数值列的Q1/Q3，在二维数组上一次计算，切换检测列时直接查表"""
+    numeric_cols = list(_col_kinds(df)['numeric'])
+    values = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    with warnings.catch_warnings():
+        # 全为空值的列结果为NaN，与pandas的quantile一致
+        warnings.simplefilter('ignore', RuntimeWarning)
+        q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+    return pd.DataFrame({'Q1': q1, 'Q3': q3}, index=numeric_cols)
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS, max_entries=DF_CACHE_MAX_ENTRIES)
+def _describe(df, cols=None):
+    """描述性统计，cols为None时统计全部列"""
+    return (df if cols is None else df[list(cols)]).describe()
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS, max_entries=DF_CACHE_MAX_ENTRIES)
+def _dtypes_table(df):
+    """列名、数据类型和非空值数量表"""
+    return pd.DataFrame({
+        '列名': df.columns,
+        '数据类型': df.dtypes.astype(str),
+        '非空值数量': df.count()
+    })
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS, max_entries=DF_CACHE_MAX_ENTRIES)
+def _top_values(df, cols, n=10):
+    """各分类列出现次数最多的n个取值，合并为一张长表"""
+    frames = [
+        df[col].value_counts().head(n).rename_axis('取值').reset_index(name='计数').assign(列名=col)
+        for col in cols
+    ]
+    return pd.concat(frames, ignore_index=True)[['列名', '取值', '计数']]
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS, max_entries=DF_CACHE_MAX_ENTRIES)
+def _corr(df, cols):
+    """指定数值列的Pearson相关系数矩阵，无缺失值时标准化后用一次矩阵乘法计算"""
+    cols = list(cols)
+    values = df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    if len(values) < 2 or np.isnan(values).any():
+        # 有缺失值时需要逐对剔除，交给pandas处理
+        return df[cols].corr()
+    
+    centered = values - values.mean(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 常数列的标准差为0，结果为NaN，与pandas一致
+        scaled = centered / centered.std(axis=0)
+    corr = np.clip(scaled.T @ scaled / len(values), -1.0, 1.0)
+    return pd.DataFrame(corr, index=cols, columns=cols)
+
 def main():
     # 主标题
     st.markdown('<div class="main-header">📊 JDC数据分析工具</div>', unsafe_allow_html=True)
@@ -130,9 +452,9 @@ def main():
     cols = st.columns(len(nav_options))
     for i, (display_name, page_name) in enumerate(nav_options.items()):
         with cols[i]:
-            if st.button(display_name, key=f"nav_{page_name}", use_container_width=True):
-                st.session_state['current_page'] = page_name
-                st.rerun()
+            # 通过回调切换页面，点击本身触发的重跑即可显示新页面，无需再次st.rerun()
+            st.button(display_name, key=f"nav_{page_name}", use_container_width=True,
+                      on_click=_set_page, args=(page_name,))
     
     # 显示当前选中的页面
     st.markdown("---")
@@ -149,6 +471,12 @@ def main():
         6. **AI洞察**: 获取智能分析建议
         7. **组件管理**: 管理自定义可视化组件
         """)
+        
+        st.checkbox("⚡ 快速读取 (PyArrow)", value=True, key="fast_io",
+                    help="使用PyArrow引擎解析CSV，Excel按块读取")
+        st.number_input("每个图表最大点数 (0=不限)", min_value=0, value=DEFAULT_MAX_CHART_POINTS,
+                        step=500, key="max_chart_points",
+                        help="折线图和散点图超过该点数时使用LTTB算法降采样")
     
     # 主内容区域
     page = st.session_state['current_page']
@@ -188,14 +516,32 @@ def show_upload_page():
             # 显示文件信息
             st.success(f"✅ 文件上传成功: {uploaded_file.name}")
             
-            # 读取并预览数据
+            # 读取并预览数据（同一文件只解析一次，保持DataFrame对象不变以命中派生统计缓存）
             try:
-                if uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
+                # 按文件内容而不是文件名判断是否需要重新解析，同名同大小的修改文件也会重新读取
+                fast_io = st.session_state.get('fast_io', True)
+                chunked = uploaded_file.name.endswith('.csv') and uploaded_file.size > CHUNKED_CSV_BYTES
+                # 内容摘要按上传的file_id缓存，同一次上传的重绘不再对整个缓冲区求哈希
+                file_id = getattr(uploaded_file, 'file_id', None)
+                if file_id is None or st.session_state.get('upload_file_id') != file_id:
+                    st.session_state['upload_content_digest'] = _upload_digest(uploaded_file)
+                    st.session_state['upload_file_id'] = file_id
+                # 解析方式不同得到的DataFrame可能不同，一并计入摘要
+                digest = f"{st.session_state['upload_content_digest']}:{'chunked' if chunked else fast_io}"
+                if st.session_state.get('dataframe_digest') == digest and 'dataframe' in st.session_state:
+                    df = st.session_state['dataframe']
                 else:
-                    df = pd.read_excel(uploaded_file)
-                
-                st.session_state['dataframe'] = df
+                    # 分块写入临时文件后按路径解析，避免getvalue()复制整个文件内容
+                    path = _spool_upload(uploaded_file)
+                    try:
+                        if chunked:
+                            df = _load_csv_chunked(path)
+                        else:
+                            df = _load_df(path, digest, uploaded_file.name, fast_io)
+                    finally:
+                        os.unlink(path)
+                    st.session_state['dataframe'] = df
+                    st.session_state['dataframe_digest'] = digest
                 
                 st.subheader("📋 数据预览")
                 st.dataframe(df.head(10), use_container_width=True)
@@ -219,6 +565,7 @@ def show_upload_page():
         - 避免特殊字符
         """)
 
+@_fragment
 def show_preview_page():
     st.header("👀 数据预览")
     
@@ -236,29 +583,40 @@ def show_preview_page():
     with col2:
         st.metric("数据列数", len(df.columns))
     with col3:
-        st.metric("缺失值", df.isnull().sum().sum())
+        st.metric("缺失值", _total_missing(df))
     with col4:
-        st.metric("内存使用", f"{df.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB")
+        st.metric("内存使用", f"{_mem_mb(df):.2f} MB")
     
-    # 数据表格
+    # 数据表格（大数据集只展示部分行，完整数据需手动开启）
     st.subheader("📋 数据表格")
-    st.dataframe(df, use_container_width=True)
+    if len(df) <= PREVIEW_ROWS:
+        st.dataframe(df, use_container_width=True)
+    else:
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            view_mode = st.radio("显示方式", ["前N行", "随机抽样"], horizontal=True)
+        with col2:
+            n_rows = st.slider("显示行数", 100, min(len(df), MAX_PREVIEW_ROWS), PREVIEW_ROWS, step=100)
+        
+        if view_mode == "随机抽样":
+            st.dataframe(df.sample(n_rows, random_state=0), use_container_width=True)
+        else:
+            st.dataframe(df.head(n_rows), use_container_width=True)
+        st.caption(f"共 {len(df):,} 行，当前显示 {n_rows:,} 行")
+        
+        if st.checkbox("显示全部数据（较慢）"):
+            st.dataframe(df, use_container_width=True)
     
     # 数据类型信息
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("📊 数据类型")
-        dtype_df = pd.DataFrame({
-            '列名': df.columns,
-            '数据类型': df.dtypes.astype(str),
-            '非空值数量': df.count()
-        })
-        st.dataframe(dtype_df, use_container_width=True)
+        st.dataframe(_dtypes_table(df), use_container_width=True)
     
     with col2:
         st.subheader("📈 基础统计")
-        st.dataframe(df.describe(), use_container_width=True)
+        st.dataframe(_describe(df), use_container_width=True)
 
 def show_analysis_page():
     st.header("🔍 数据分析")
@@ -279,32 +637,30 @@ def show_analysis_page():
         st.subheader("📊 描述性统计分析")
         
         # 数值列统计
-        numeric_cols = df.select_dtypes(include=['number']).columns
+        numeric_cols = _col_kinds(df)['numeric']
         if len(numeric_cols) > 0:
             st.write("**数值列统计:**")
-            st.dataframe(df[numeric_cols].describe(), use_container_width=True)
+            st.dataframe(_describe(df, numeric_cols), use_container_width=True)
         
         # 分类列统计
-        categorical_cols = df.select_dtypes(include=['object']).columns
+        categorical_cols = _col_kinds(df)['object']
         if len(categorical_cols) > 0:
             st.write("**分类列统计:**")
-            for col in categorical_cols:
-                st.write(f"**{col}:**")
-                st.write(df[col].value_counts().head(10))
+            st.dataframe(_top_values(df, categorical_cols), use_container_width=True, hide_index=True)
     
     elif analysis_type == "相关性分析":
         st.subheader("🔗 相关性分析")
-        numeric_cols = df.select_dtypes(include=['number']).columns
+        numeric_cols = _col_kinds(df)['numeric']
         
         if len(numeric_cols) > 1:
-            corr_matrix = df[numeric_cols].corr()
+            corr_matrix = _corr(df, numeric_cols)
             st.dataframe(corr_matrix, use_container_width=True)
         else:
             st.warning("需要至少2个数值列进行相关性分析")
     
     elif analysis_type == "缺失值分析":
         st.subheader("❓ 缺失值分析")
-        missing_data = df.isnull().sum()
+        missing_data = _missing(df)
         missing_percent = (missing_data / len(df)) * 100
         
         missing_df = pd.DataFrame({
@@ -321,19 +677,20 @@ def show_analysis_page():
     
     elif analysis_type == "异常值检测":
         st.subheader("🚨 异常值检测")
-        numeric_cols = df.select_dtypes(include=['number']).columns
+        numeric_cols = _col_kinds(df)['numeric']
         
         if len(numeric_cols) > 0:
             selected_col = st.selectbox("选择要检测的列", numeric_cols)
             
-            # 使用IQR方法检测异常值
-            Q1 = df[selected_col].quantile(0.25)
-            Q3 = df[selected_col].quantile(0.75)
+            # 使用IQR方法检测异常值（分位数来自缓存的全列计算结果，在numpy数组上生成掩码）
+            values = df[selected_col].to_numpy(dtype=np.float64, na_value=np.nan)
+            Q1, Q3 = _quartiles(df).loc[selected_col, ['Q1', 'Q3']]
             IQR = Q3 - Q1
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
             
-            outliers = df[(df[selected_col] < lower_bound) | (df[selected_col] > upper_bound)]
+            mask = np.logical_or(values < lower_bound, values > upper_bound)
+            outliers = df[mask]
             
             st.write(f"**{selected_col} 列异常值检测结果:**")
             st.write(f"- 下界: {lower_bound:.2f}")
@@ -341,7 +698,9 @@ def show_analysis_page():
             st.write(f"- 异常值数量: {len(outliers)}")
             
             if len(outliers) > 0:
-                st.dataframe(outliers, use_container_width=True)
+                st.dataframe(outliers.head(PREVIEW_ROWS), use_container_width=True)
+                if len(outliers) > PREVIEW_ROWS:
+                    st.caption(f"仅显示前 {PREVIEW_ROWS} 条异常值")
         else:
             st.warning("没有数值列可供异常值检测")
 
@@ -366,23 +725,40 @@ def show_visualization_page():
     with tab3:
         show_performance_monitoring()
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _get_adapters():
+    """获取可用适配器列表，缓存1分钟避免每次重跑都请求后端"""
+    response = _api("GET", "/api/multi_lib/adapters", timeout=5)
+    response.raise_for_status()
+    response_data = _json_response(response)
+    # 处理嵌套的adapters结构
+    if 'adapters' in response_data and 'adapters' in response_data['adapters']:
+        return list(response_data['adapters']['adapters'].values())
+    return response_data.get('adapters', [])
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _get_chart_types(adapter):
+    """获取适配器支持的图表类型，缓存1分钟"""
+    response = _api("GET", "/api/multi_lib/chart_types", params={'adapter': adapter}, timeout=5)
+    response.raise_for_status()
+    return _json_response(response)['chart_types']
+
+@functools.lru_cache(maxsize=8)
+def _adapter_label(name):
+    """适配器在下拉框中的显示名称"""
+    return f"{name} ({'ECharts' if name == 'echarts' else 'Bokeh' if name == 'bokeh' else name})"
+
+@_fragment
 def show_single_library_mode(df):
     """单库可视化模式"""
     st.subheader("单库可视化生成")
     
     # 获取可用适配器
     try:
-        response = requests.get(f"{BACKEND_URL}/api/multi_lib/adapters")
-        if response.status_code == 200:
-            response_data = response.json()
-            # 处理嵌套的adapters结构
-            if 'adapters' in response_data and 'adapters' in response_data['adapters']:
-                adapters = list(response_data['adapters']['adapters'].values())
-            else:
-                adapters = response_data.get('adapters', [])
-        else:
-            st.error("无法获取可用适配器")
-            return
+        adapters = _get_adapters()
+    except requests.HTTPError:
+        st.error("无法获取可用适配器")
+        return
     except Exception as e:
         st.error(f"连接后端失败: {str(e)}")
         return
@@ -395,17 +771,12 @@ def show_single_library_mode(df):
         selected_adapter = st.selectbox(
             "选择可视化库",
             options=[adapter['name'] for adapter in adapters],
-            format_func=lambda x: f"{x} ({'ECharts' if x == 'echarts' else 'Bokeh' if x == 'bokeh' else x})"
+            format_func=_adapter_label
         )
         
         # 获取支持的图表类型
         try:
-            response = requests.get(f"{BACKEND_URL}/api/multi_lib/chart_types", 
-                                  params={'adapter': selected_adapter})
-            if response.status_code == 200:
-                chart_types = response.json()['chart_types']
-            else:
-                chart_types = ["line", "bar", "scatter", "pie", "histogram"]
+            chart_types = _get_chart_types(selected_adapter)
         except:
             chart_types = ["line", "bar", "scatter", "pie", "histogram"]
         
@@ -428,8 +799,8 @@ def show_single_library_mode(df):
     
     with col2:
         # 数据列选择
-        numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        numeric_cols = list(_col_kinds(df)['numeric'])
+        categorical_cols = list(_col_kinds(df)['categorical'])
         
         if chart_type in ['line', 'bar', 'scatter']:
             col_x, col_y = st.columns(2)
@@ -478,10 +849,10 @@ def generate_single_chart(df, adapter, chart_type, x_column, y_column):
                 }
             }
             
-            response = requests.post(f"{BACKEND_URL}/api/multi_lib/generate_chart", json=payload)
+            response = _post_json("/api/multi_lib/generate_chart", payload, stream=True)
             
             if response.status_code == 200:
-                result = response.json()
+                result = _read_json_stream(response)
                 
                 # 显示图表
                 display_chart(result, adapter, height=600)
@@ -503,23 +874,17 @@ def generate_single_chart(df, adapter, chart_type, x_column, y_column):
         except Exception as e:
             st.error(f"生成图表时出错: {str(e)}")
 
+@_fragment
 def show_comparison_mode(df):
     """对比模式界面"""
     st.subheader("多库对比模式")
     
     # 获取可用适配器
     try:
-        response = requests.get(f"{BACKEND_URL}/api/multi_lib/adapters")
-        if response.status_code == 200:
-            response_data = response.json()
-            # 处理嵌套的adapters结构
-            if 'adapters' in response_data and 'adapters' in response_data['adapters']:
-                adapters = list(response_data['adapters']['adapters'].values())
-            else:
-                adapters = response_data.get('adapters', [])
-        else:
-            st.error("无法获取可用适配器")
-            return
+        adapters = _get_adapters()
+    except requests.HTTPError:
+        st.error("无法获取可用适配器")
+        return
     except Exception as e:
         st.error(f"连接后端失败: {str(e)}")
         return
@@ -532,7 +897,7 @@ def show_comparison_mode(df):
             "选择要对比的可视化库",
             options=[adapter['name'] for adapter in adapters],
             default=[adapters[0]['name'], adapters[1]['name']] if len(adapters) >= 2 else [adapters[0]['name']],
-            format_func=lambda x: f"{x} ({'ECharts' if x == 'echarts' else 'Bokeh' if x == 'bokeh' else x})"
+            format_func=_adapter_label
         )
     
     with col2:
@@ -553,8 +918,8 @@ def show_comparison_mode(df):
         )
     
     # 数据列选择
-    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    numeric_cols = list(_col_kinds(df)['numeric'])
+    categorical_cols = list(_col_kinds(df)['categorical'])
     
     if chart_type in ['line', 'bar', 'scatter']:
         col_x, col_y = st.columns(2)
@@ -594,10 +959,10 @@ def generate_comparison_charts(df, adapters, chart_type, x_column, y_column):
                 }
             }
             
-            response = requests.post(f"{BACKEND_URL}/api/multi_lib/compare", json=payload)
+            response = _post_json("/api/multi_lib/compare", payload, stream=True)
             
             if response.status_code == 200:
-                result = response.json()
+                result = _read_json_stream(response)
                 
                 # 并排显示图表
                 cols = st.columns(len(adapters))
@@ -634,16 +999,17 @@ def generate_comparison_charts(df, adapters, chart_type, x_column, y_column):
         except Exception as e:
             st.error(f"生成对比图表时出错: {str(e)}")
 
+@_fragment
 def show_performance_monitoring():
     """性能监控界面"""
     st.subheader("📈 性能监控面板")
     
     try:
         # 获取性能指标
-        response = requests.get(f"{BACKEND_URL}/api/multi_lib/performance")
+        response = _api("GET", "/api/multi_lib/performance")
         
         if response.status_code == 200:
-            perf_data = response.json()
+            perf_data = _json_response(response)
             
             # 显示总体性能指标
             st.subheader("📊 总体性能指标")
@@ -683,15 +1049,15 @@ def show_performance_monitoring():
             # 实时性能监控
             st.subheader("⚡ 实时性能监控")
             
-            if st.button("🔄 刷新性能数据"):
-                st.rerun()
+            # 点击按钮即触发本片段重跑并重新获取性能数据，无需st.rerun()重跑整个页面
+            st.button("🔄 刷新性能数据")
             
             # 性能趋势图（如果有历史数据）
             if 'performance_history' in perf_data:
                 history_df = pd.DataFrame(perf_data['performance_history'])
                 if not history_df.empty:
                     fig_trend = px.line(history_df, x='timestamp', y='render_time',
-                                      color='adapter', title="渲染时间趋势")
+                                      color='adapter', title="渲染时间趋势", render_mode='webgl')
                     st.plotly_chart(fig_trend, use_container_width=True)
         
         else:
@@ -708,7 +1074,6 @@ def display_chart(result, adapter, height=600):
             components.html(result['chart_html'], height=height)
         elif 'chart_data' in result:
             # 如果返回的是图表数据，使用Plotly显示
-            import plotly.graph_objects as go
             fig = go.Figure(result['chart_data'])
             st.plotly_chart(fig, use_container_width=True)
         else:
@@ -716,20 +1081,140 @@ def display_chart(result, adapter, height=600):
     except Exception as e:
         st.error(f"显示 {adapter} 图表时出错: {str(e)}")
 
+# orjson可直接序列化的numpy数组类型
+_ORJSON_NUMPY_DTYPES = frozenset(np.dtype(t) for t in (
+    'float64', 'float32', 'int64', 'int32', 'int16', 'int8',
+    'uint64', 'uint32', 'uint16', 'uint8', 'bool'
+))
+
+def _column_values(values):
+    """图表列数据：数值列保留numpy数组交给orjson直接序列化，其他类型转为列表"""
+    array = np.asarray(values)
+    if orjson is not None and array.dtype in _ORJSON_NUMPY_DTYPES:
+        return np.ascontiguousarray(array)
+    return array.tolist()
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+def _json_default(obj):
+    """无法直接序列化的numpy对象转为Python原生类型"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def _json_response(response):
+    """解析JSON响应体，优先使用orjson"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+# 流式读取响应体时每次读取的字节数
+RESPONSE_CHUNK_BYTES = 64 * 1024
+
+def _read_json_stream(response):
+    """把流式响应逐块读入同一个缓冲区再解析，避免整体缓冲后再拼接的额外副本"""
+    buffer = bytearray()
+    with response:
+        for chunk in response.iter_content(RESPONSE_CHUNK_BYTES):
+            buffer += chunk
+    if orjson is not None:
+        return orjson.loads(buffer)
+    return json.loads(buffer)
+
+def _dumps_json(payload):
+    """把请求体序列化为JSON字节串，优先使用orjson"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=_json_default).encode('utf-8')
+
+def _post_json(path, payload, **kwargs):
+    """序列化payload后通过共享会话发送POST请求"""
+    return _api("POST", path, data=_dumps_json(payload), headers=JSON_HEADERS, **kwargs)
+
+# 相关性热力图逐格标注数值的最大列数
+HEATMAP_TEXT_MAX_COLS = 20
+
+# 折线图/散点图默认最大点数，超过时降采样
+DEFAULT_MAX_CHART_POINTS = 2000
+
+def _lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets降采样，返回保留点的下标，保持曲线形状"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    every = (n - 2) / (n_out - 2)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        # 当前桶与下一个桶的范围
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        # 选取与上一个选中点、下一桶均值构成三角形面积最大的点
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        area = np.abs((x[a] - avg_x) * (bucket_y - y[a]) - (x[a] - bucket_x) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+def _downsample_xy(df, x_column, y_column, max_points):
+    """对折线图/散点图数据做LTTB降采样，返回保留行的位置下标"""
+    y = df[y_column].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = np.flatnonzero(~np.isnan(y))
+    
+    # x为单调数值时按实际坐标计算面积，否则按行序
+    x_series = df[x_column]
+    if x_series.dtype.kind in 'biuf' and x_series.is_monotonic_increasing:
+        x = x_series.to_numpy(dtype=np.float64)[valid]
+    else:
+        x = valid.astype(np.float64)
+    return valid[_lttb_indices(x, y[valid], max_points)]
+
+def _group_polars(df, x_column, y_column, agg_expr):
+    """用polars惰性查询按x_column分组聚合，结果按分组键排序并丢弃空键，与pandas groupby一致"""
+    return (
+        pl.from_pandas(df[[x_column, y_column]])
+        .lazy()
+        .drop_nulls(subset=x_column)
+        .group_by(x_column)
+        .agg(agg_expr)
+        .sort(x_column)
+        .collect()
+    )
+
 def prepare_chart_data(df, chart_type, x_column, y_column):
     """准备图表数据"""
+    use_polars = USE_POLARS and x_column and y_column and x_column != y_column
+
     if chart_type == 'histogram':
         return {
-            'x': df[x_column].tolist(),
+            'x': _column_values(df[x_column]),
             'chart_type': chart_type
         }
     elif chart_type == 'pie':
-        if y_column:
+        if y_column and use_polars:
+            grouped = _group_polars(df, x_column, y_column, pl.col(y_column).sum())
+            return {
+                'labels': grouped[x_column].to_list(),
+                'values': _column_values(grouped[y_column].to_numpy()),
+                'chart_type': chart_type
+            }
+        elif y_column:
             # 按分类聚合数值
             grouped = df.groupby(x_column)[y_column].sum().reset_index()
             return {
                 'labels': grouped[x_column].tolist(),
-                'values': grouped[y_column].tolist(),
+                'values': _column_values(grouped[y_column]),
                 'chart_type': chart_type
             }
         else:
@@ -737,20 +1222,27 @@ def prepare_chart_data(df, chart_type, x_column, y_column):
             value_counts = df[x_column].value_counts()
             return {
                 'labels': value_counts.index.tolist(),
-                'values': value_counts.values.tolist(),
+                'values': _column_values(value_counts.values),
                 'chart_type': chart_type
             }
     elif chart_type == 'heatmap':
         # 相关性矩阵
-        corr_matrix = df[x_column].corr()
+        corr_matrix = _corr(df, tuple(x_column))
         return {
-            'z': corr_matrix.values.tolist(),
+            'z': _column_values(corr_matrix.values),
             'x': corr_matrix.columns.tolist(),
             'y': corr_matrix.index.tolist(),
             'chart_type': chart_type
         }
     elif chart_type == 'box':
-        if x_column:
+        if use_polars:
+            # 分组箱线图，polars直接聚合为列表，避免pandas逐组apply(list)
+            grouped = _group_polars(df, x_column, y_column, pl.col(y_column))
+            return {
+                'groups': dict(zip(grouped[x_column].to_list(), grouped[y_column].to_list())),
+                'chart_type': chart_type
+            }
+        elif x_column:
             # 分组箱线图
             groups = df.groupby(x_column)[y_column].apply(list).to_dict()
             return {
@@ -760,14 +1252,17 @@ def prepare_chart_data(df, chart_type, x_column, y_column):
         else:
             # 单个箱线图
             return {
-                'y': df[y_column].tolist(),
+                'y': _column_values(df[y_column]),
                 'chart_type': chart_type
             }
     else:
-        # 标准 x-y 图表
+        # 标准 x-y 图表，折线图和散点图点数过多时先降采样
+        max_points = st.session_state.get('max_chart_points', DEFAULT_MAX_CHART_POINTS)
+        if chart_type in ('line', 'scatter') and y_column and max_points and len(df) > max_points:
+            df = df.iloc[_downsample_xy(df, x_column, y_column, max_points)]
         return {
-            'x': df[x_column].tolist(),
-            'y': df[y_column].tolist() if y_column else None,
+            'x': _column_values(df[x_column]),
+            'y': _column_values(df[y_column]) if y_column else None,
             'chart_type': chart_type
         }
 
@@ -805,13 +1300,13 @@ def show_report_page():
                     'shape': df.shape,
                     'columns': df.columns.tolist(),
                     'dtypes': df.dtypes.astype(str).to_dict(),
-                    'memory_usage': f"{df.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB",
-                    'missing_values': df.isnull().sum().to_dict()
+                    'memory_usage': f"{_mem_mb(df):.2f} MB",
+                    'missing_values': _missing(df).to_dict()
                 }
                 
                 # 数据质量评估
-                missing_percentage = (df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100
-                duplicate_rows = df.duplicated().sum()
+                missing_percentage = (_total_missing(df) / (len(df) * len(df.columns))) * 100
+                duplicate_rows = _dup_count(df)
                 
                 quality_score = max(0, 100 - missing_percentage * 2 - duplicate_rows / len(df) * 10)
                 
@@ -838,20 +1333,27 @@ def show_report_page():
                 
                 if include_charts and "缺失值分析" in chart_types:
                     # 缺失值分析图
-                    missing_data = df.isnull().sum()
+                    missing_data = _missing(df)
                     missing_data = missing_data[missing_data > 0]
                     if len(missing_data) > 0:
-                        fig = px.bar(x=missing_data.index, y=missing_data.values,
-                                   title="各列缺失值数量")
+                        fig = go.Figure(go.Bar(x=missing_data.index, y=missing_data.values,
+                                               marker_line_width=0))
+                        fig.update_layout(title="各列缺失值数量")
                         charts_data.append(fig)
                 
                 if include_charts and "相关性热力图" in chart_types:
                     # 相关性热力图
-                    numeric_cols = df.select_dtypes(include=['number']).columns
+                    numeric_cols = _col_kinds(df)['numeric']
                     if len(numeric_cols) > 1:
-                        corr_matrix = df[numeric_cols].corr()
-                        fig = px.imshow(corr_matrix, text_auto=True, aspect="auto",
-                                      title="数值变量相关性热力图")
+                        corr_matrix = _corr(df, numeric_cols)
+                        # 热力图本身以栅格绘制，列数较多时不再逐格标注数值，避免大量SVG文本节点
+                        fig = go.Figure(go.Heatmap(
+                            z=corr_matrix.values,
+                            x=corr_matrix.columns,
+                            y=corr_matrix.index,
+                            texttemplate="%{z:.2f}" if len(corr_matrix) <= HEATMAP_TEXT_MAX_COLS else None
+                        ))
+                        fig.update_layout(title="数值变量相关性热力图", yaxis_autorange='reversed')
                         charts_data.append(fig)
                 
                 # 显示报告内容
@@ -890,15 +1392,15 @@ def show_report_page():
                 if quality_assessment['duplicate_rows'] > 0:
                     recommendations.append("建议删除重复行以提高数据质量")
                 
-                numeric_cols = df.select_dtypes(include=['number']).columns
+                numeric_cols = _col_kinds(df)['numeric']
                 if len(numeric_cols) > 1:
                     recommendations.append("可以进行相关性分析，识别变量间的关系")
                 
                 if len(recommendations) == 0:
                     st.success("数据质量良好，无明显问题")
                 else:
-                    for rec in recommendations:
-                        st.info(rec)
+                    # 所有建议合并为一个提示框，只创建一个元素
+                    st.info("\n".join(f"- {rec}" for rec in recommendations))
                 
                 # 导出选项
                 st.subheader("📥 导出报告")
@@ -909,9 +1411,18 @@ def show_report_page():
                         'quality_assessment': quality_assessment,
                         'recommendations': recommendations
                     }
+                    # 直接把UTF-8字节交给下载按钮，不再额外转成str
+                    if orjson is not None:
+                        report_data = orjson.dumps(
+                            report_json, default=_json_default,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                        )
+                    else:
+                        report_data = json.dumps(report_json, ensure_ascii=False, indent=2,
+                                                 default=_json_default).encode('utf-8')
                     st.download_button(
                         label="下载JSON报告",
-                        data=json.dumps(report_json, ensure_ascii=False, indent=2),
+                        data=report_data,
                         file_name=f"{report_title}_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.json",
                         mime="application/json"
                     )
@@ -926,7 +1437,7 @@ def show_component_management_page():
     
     # 初始化组件状态
     if 'viz_components' not in st.session_state:
-        st.session_state['viz_components'] = get_available_viz_components()
+        _refresh_viz_components()
     
     # 页面布局
     tab1, tab2, tab3 = st.tabs(["📋 组件列表", "➕ 添加组件", "📖 使用说明"])
@@ -935,30 +1446,10 @@ def show_component_management_page():
         st.subheader("当前可用组件")
         
         # 组件分类显示
-        component_categories = {}
-        for component in st.session_state['viz_components']:
-            category = component.get('category', 'other')
-            if category not in component_categories:
-                component_categories[category] = []
-            component_categories[category].append(component)
-        
-        # 显示组件分类
-        category_names = {
-            'ai': '🤖 AI智能',
-            'trend': '📈 趋势分析',
-            'comparison': '📊 对比分析',
-            'correlation': '🔗 关联分析',
-            'distribution': '📊 分布分析',
-            'proportion': '🥧 比例分析',
-            'multivariate': '🎯 多元分析',
-            'summary': '📋 汇总展示',
-            'raw_data': '📊 原始数据',
-            'custom': '🎨 自定义',
-            'other': '📁 其他'
-        }
+        component_categories = _group_components()
         
         for category, components in component_categories.items():
-            with st.expander(f"{category_names.get(category, category)} ({len(components)})", expanded=True):
+            with st.expander(f"{CATEGORY_NAMES.get(category, category)} ({len(components)})", expanded=True):
                 for component in components:
                     col1, col2, col3, col4 = st.columns([1, 2, 3, 1])
                     with col1:
@@ -976,51 +1467,7 @@ def show_component_management_page():
     
     with tab2:
         st.subheader("添加自定义组件")
-        
-        with st.form("add_component_form"):
-            col1, col2 = st.columns(2)
-            with col1:
-                new_component_name = st.text_input("组件名称*", placeholder="例如: 自定义散点图")
-                new_component_type = st.selectbox("组件类型*", ['chart', 'table', 'metric', 'widget'])
-                new_component_category = st.selectbox("组件分类*", list(category_names.keys()))
-            
-            with col2:
-                new_component_icon = st.text_input("图标 (emoji)*", "🎨", placeholder="例如: 📊")
-                new_component_description = st.text_input("描述", placeholder="组件功能描述")
-                new_component_persistent = st.checkbox("持久化保存", value=True)
-            
-            new_component_config = st.text_area(
-                "配置 (JSON格式)*", 
-                '{"color": "blue", "style": "modern"}',
-                help="组件的配置参数，必须是有效的JSON格式",
-                height=100
-            )
-            
-            submitted = st.form_submit_button("添加组件", type="primary", use_container_width=True)
-            
-            if submitted:
-                if new_component_name and new_component_config:
-                    try:
-                        # 验证JSON格式
-                        json.loads(new_component_config)
-                        
-                        if add_custom_viz_component(
-                            new_component_name, 
-                            new_component_type, 
-                            new_component_config,
-                            new_component_category,
-                            new_component_description,
-                            new_component_icon,
-                            new_component_persistent
-                        ):
-                            st.success(f"✅ 成功添加组件: {new_component_name}")
-                            st.rerun()
-                        else:
-                            st.error("❌ 添加组件失败")
-                    except json.JSONDecodeError:
-                        st.error("❌ 配置格式错误，请输入有效的JSON格式")
-                else:
-                    st.error("❌ 请填写必填字段（标记*的字段）")
+        _render_add_component_form("manage")
     
     with tab3:
         st.subheader("使用说明")
@@ -1069,7 +1516,7 @@ def show_ai_insights_page():
     if 'selected_chart_type' not in st.session_state:
         st.session_state['selected_chart_type'] = 'auto'
     if 'viz_components' not in st.session_state:
-        st.session_state['viz_components'] = get_available_viz_components()
+        _refresh_viz_components()
     
     if 'dataframe' not in st.session_state:
         st.warning("⚠️ 请先上传数据文件")
@@ -1086,21 +1533,10 @@ def show_ai_insights_page():
         st.markdown("### 🎨 可视化设置")
         
         # 图表类型选择
-        chart_types = {
-            'auto': '🤖 智能推荐',
-            'line': '📈 折线图',
-            'bar': '📊 柱状图',
-            'scatter': '🔵 散点图',
-            'histogram': '📊 直方图',
-            'box': '📦 箱线图',
-            'heatmap': '🔥 热力图',
-            'pie': '🥧 饼图'
-        }
-        
         st.session_state['selected_chart_type'] = st.selectbox(
             "默认图表类型",
-            options=list(chart_types.keys()),
-            format_func=lambda x: chart_types[x],
+            options=list(CHART_TYPES.keys()),
+            format_func=lambda x: CHART_TYPES[x],
             index=0,
             help="选择AI分析时默认使用的图表类型。选择'智能推荐'时，AI会根据数据特征自动选择最合适的图表类型。"
         )
@@ -1140,83 +1576,31 @@ def show_ai_insights_page():
         # 快速组件选择
         st.markdown("### ⚙️ 快速组件")
         
-        # 组件分类显示（简化版）
-        component_categories = {}
-        for component in st.session_state['viz_components']:
-            category = component.get('category', 'other')
-            if category not in component_categories:
-                component_categories[category] = []
-            component_categories[category].append(component)
-        
-        # 显示组件分类
-        category_names = {
-            'ai': '🤖 AI智能',
-            'trend': '📈 趋势分析',
-            'comparison': '📊 对比分析',
-            'correlation': '🔗 关联分析',
-            'distribution': '📊 分布分析',
-            'proportion': '🥧 比例分析',
-            'multivariate': '🎯 多元分析',
-            'summary': '📋 汇总展示',
-            'raw_data': '📊 原始数据',
-            'custom': '🎨 自定义',
-            'other': '📁 其他'
-        }
+        # 组件分类显示（简化版）：只渲染当前选中分类下的组件
+        component_categories = _group_components()
         
-        for category, components in component_categories.items():
-            with st.expander(f"{category_names.get(category, category)} ({len(components)})"):
-                for component in components:
-                    col1, col2, col3 = st.columns([2, 2, 1])
-                    with col1:
-                        st.text(f"{component['icon']} {component['name']}")
-                    with col2:
-                        st.caption(component.get('description', '无描述'))
-                    with col3:
-                        if component.get('custom', False):
-                            if st.button("🗑️", key=f"del_{component['id']}", help="删除组件"):
-                                if remove_viz_component(component['id']):
-                                    st.rerun()
+        if component_categories:
+            selected_category = st.selectbox(
+                "组件分类",
+                options=list(component_categories.keys()),
+                format_func=lambda k: f"{CATEGORY_NAMES.get(k, k)} ({len(component_categories[k])})",
+                key="quick_component_category"
+            )
+            for component in component_categories[selected_category]:
+                col1, col2, col3 = st.columns([2, 2, 1])
+                with col1:
+                    st.text(f"{component['icon']} {component['name']}")
+                with col2:
+                    st.caption(component.get('description', '无描述'))
+                with col3:
+                    if component.get('custom', False):
+                        if st.button("🗑️", key=f"del_{component['id']}", help="删除组件"):
+                            if remove_viz_component(component['id']):
+                                st.rerun()
         
         # 添加新组件
         with st.expander("➕ 添加自定义组件"):
-            col1, col2 = st.columns(2)
-            with col1:
-                new_component_name = st.text_input("组件名称")
-                new_component_type = st.selectbox("组件类型", ['chart', 'table', 'metric', 'widget'])
-                new_component_category = st.selectbox("组件分类", list(category_names.keys()))
-            
-            with col2:
-                new_component_icon = st.text_input("图标 (emoji)", "🎨")
-                new_component_description = st.text_input("描述")
-                new_component_persistent = st.checkbox("持久化保存", value=True)
-            
-            new_component_config = st.text_area(
-                "配置 (JSON格式)", 
-                '{"color": "blue", "style": "modern"}',
-                help="组件的配置参数，必须是有效的JSON格式"
-            )
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("添加组件", type="primary", use_container_width=True):
-                    if new_component_name:
-                        if add_custom_viz_component(
-                            new_component_name, 
-                            new_component_type, 
-                            new_component_config,
-                            new_component_category,
-                            new_component_description,
-                            new_component_icon,
-                            new_component_persistent
-                        ):
-                            st.success(f"已添加组件: {new_component_name}")
-                            st.rerun()
-                    else:
-                        st.error("请输入组件名称")
-            
-            with col2:
-                if st.button("重置表单", use_container_width=True):
-                    st.rerun()
+            _render_add_component_form("sidebar")
         
         # 组件导入导出
         with st.expander("📦 组件导入导出"):
@@ -1251,44 +1635,6 @@ def show_ai_insights_page():
                         else:
                             st.error("组件导入失败")
     
-    # AI对话界面
-    
-    # 显示聊天历史 - 自适应高度
-    chat_container = st.container()
-    with chat_container:
-            for i, message in enumerate(st.session_state['chat_history']):
-                if message['role'] == 'user':
-                    with st.chat_message("user"):
-                        st.write(message['content'])
-                else:
-                    with st.chat_message("assistant"):
-                        st.write(message['content'])
-                        
-                        # 如果消息包含图表数据，显示图表
-                        if 'chart' in message and message['chart']:
-                            chart_data = message['chart']
-                            # 检查chart_data是否为字典类型
-                            if isinstance(chart_data, dict) and chart_data.get('chart_base64'):
-                                st.markdown(f"**{chart_data.get('title', '数据可视化')}**")
-                                
-                                # 显示图表
-                                import base64
-                                chart_base64 = chart_data['chart_base64']
-                                # 去掉data:image/png;base64,前缀
-                                if chart_base64.startswith('data:image/png;base64,'):
-                                    chart_base64 = chart_base64.replace('data:image/png;base64,', '')
-                                chart_bytes = base64.b64decode(chart_base64)
-                                st.image(chart_bytes, use_column_width=True)
-                                
-                                if chart_data.get('description'):
-                                    st.caption(chart_data['description'])
-                            elif isinstance(chart_data, str):
-                                # 如果chart_data是字符串，显示为文本
-                                st.info(f"图表数据: {chart_data}")
-                            else:
-                                # 其他类型，显示调试信息
-                                st.warning(f"未知的图表数据类型: {type(chart_data)}")
-    
     # 数据概览卡片
     st.markdown("""
     <div style="
@@ -1319,12 +1665,16 @@ def show_ai_insights_page():
             </div>
         </div>
     </div>
-    """.format(
-        len(df),
-        len(df.columns),
-        len(df.select_dtypes(include=[np.number]).columns),
-        (df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100
-    ), unsafe_allow_html=True)
+    """.format(*_overview_stats(df)), unsafe_allow_html=True)
+    
+    # AI对话界面
+    _chat_fragment(df)
+
+@_fragment
+def _chat_fragment(df):
+    """AI对话区域：提问时只重跑该片段，侧边栏和数据概览不随之重绘"""
+    # 显示聊天历史 - 自适应高度
+    chat_container = st.container()
     
     # Grok风格的预设问题布局
     st.markdown("### 🎯 智能提问")
@@ -1369,21 +1719,7 @@ def show_ai_insights_page():
                             ai_response = generate_ai_insight(df, question)
                         
                         # 处理AI响应（可能包含图表数据）
-                        if isinstance(ai_response, dict) and 'chart' in ai_response:
-                            # 如果响应包含图表数据，分别保存文本和图表
-                            st.session_state['chat_history'].append({
-                                'role': 'assistant',
-                                'content': ai_response['text'],
-                                'chart': ai_response['chart']
-                            })
-                        else:
-                            # 普通文本响应
-                            st.session_state['chat_history'].append({
-                                'role': 'assistant',
-                                'content': ai_response
-                            })
-                        
-                        st.rerun()
+                        _append_ai_response(ai_response)
     
     # 用户输入区域
     st.markdown("---")
@@ -1395,7 +1731,6 @@ def show_ai_insights_page():
     with col2:
         if st.button("🗑️ 清除历史", use_container_width=True):
             st.session_state['chat_history'] = []
-            st.rerun()
     
     if user_input:
         # 添加用户消息
@@ -1404,80 +1739,126 @@ def show_ai_insights_page():
             'content': user_input
         })
         
-        # 创建状态容器
-        status_container = st.empty()
-        progress_container = st.empty()
-        
-        # 显示详细的进度状态
-        with status_container.container():
-            st.info("🤖 **AI分析进行中...**")
-            
-        with progress_container.container():
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            # 模拟进度更新
-            import time
-            status_text.text("📊 正在分析数据结构...")
-            progress_bar.progress(20)
-            time.sleep(0.5)
-            
-            status_text.text("🧠 正在调用AI模型...")
-            progress_bar.progress(40)
-            time.sleep(0.5)
-            
-            status_text.text("📈 正在生成洞察分析...")
-            progress_bar.progress(60)
-            
-        # 生成AI回答
-        ai_response = generate_ai_insight(df, user_input)
-        
-        # 更新进度
-        with progress_container.container():
-            status_text.text("✨ 正在整理分析结果...")
-            progress_bar.progress(80)
-            time.sleep(0.3)
-            
-            status_text.text("🎯 分析完成！")
-            progress_bar.progress(100)
-            time.sleep(0.5)
-        
-        # 清除状态显示
-        status_container.empty()
-        progress_container.empty()
+        # 按实际执行阶段更新状态，不再人为等待
+        with st.status("🤖 AI分析进行中...", expanded=True) as status:
+            st.write("🧠 正在调用AI模型...")
+            ai_response = generate_ai_insight(df, user_input)
+            status.update(label="🎯 分析完成！", state="complete", expanded=False)
         
         # 处理AI响应（可能包含图表数据）
-        if isinstance(ai_response, dict) and 'chart' in ai_response:
-            # 如果响应包含图表数据，分别保存文本和图表
-            st.session_state['chat_history'].append({
-                'role': 'assistant',
-                'content': ai_response['text'],
-                'chart': ai_response['chart']
-            })
-        else:
-            # 普通文本响应
-            st.session_state['chat_history'].append({
-                'role': 'assistant',
-                'content': ai_response
-            })
-        
-        st.rerun()
+        _append_ai_response(ai_response)
+    
+    # 本次提问处理完后再填充聊天记录，新消息无需重跑即可显示
+    with chat_container:
+        for i, message in enumerate(st.session_state['chat_history']):
+            if message['role'] == 'user':
+                with st.chat_message("user"):
+                    st.write(message['content'])
+            else:
+                with st.chat_message("assistant"):
+                    st.write(message['content'])
+                    
+                    # 如果消息包含图表数据，显示图表
+                    if 'chart' in message and message['chart']:
+                        chart_data = message['chart']
+                        # 检查chart_data是否为字典类型
+                        if isinstance(chart_data, dict) and (
+                                chart_data.get('_bytes') is not None or chart_data.get('chart_base64')):
+                            st.markdown(f"**{chart_data.get('title', '数据可视化')}**")
+                            
+                            # 显示图表，优先使用加入历史时已解码并缩放的字节
+                            chart_bytes = chart_data.get('_bytes')
+                            if chart_bytes is None:
+                                chart_bytes = _chat_chart_bytes(chart_data['chart_base64'])
+                            st.image(chart_bytes, width=CHAT_CHART_WIDTH)
+                            
+                            if chart_data.get('description'):
+                                st.caption(chart_data['description'])
+                        elif isinstance(chart_data, str):
+                            # 如果chart_data是字符串，显示为文本
+                            st.info(f"图表数据: {chart_data}")
+                        else:
+                            # 其他类型，显示调试信息
+                            st.warning(f"未知的图表数据类型: {type(chart_data)}")
+
+CHART_DATA_URL_PREFIX = 'data:image/png;base64,'
+
+# 聊天历史最多保留的消息数，以及保留原始图表base64的最近消息数
+CHAT_HISTORY_MAX = 50
+CHAT_CHART_BASE64_KEEP = 10
+
+# 聊天中图表的最大像素尺寸和显示宽度
+CHAT_CHART_MAX_SIZE = (900, 600)
+CHAT_CHART_WIDTH = 700
+
+def _decode_chart_base64(chart_base64):
+    """解码图表base64字符串，去掉data:image/png;base64,前缀"""
+    if chart_base64.startswith(CHART_DATA_URL_PREFIX):
+        chart_base64 = chart_base64[len(CHART_DATA_URL_PREFIX):]
+    return base64.b64decode(chart_base64)
+
+def _chat_chart_bytes(chart_base64):
+    """解码图表并在服务端缩小到聊天显示尺寸，减少每次重绘发送给浏览器的数据量"""
+    png_bytes = _decode_chart_base64(chart_base64)
+    try:
+        with Image.open(BytesIO(png_bytes)) as image:
+            if image.width <= CHAT_CHART_MAX_SIZE[0] and image.height <= CHAT_CHART_MAX_SIZE[1]:
+                return png_bytes
+            image.thumbnail(CHAT_CHART_MAX_SIZE)
+            buffer = BytesIO()
+            image.save(buffer, format='PNG', optimize=True)
+            return buffer.getvalue()
+    except OSError:
+        # 无法识别的图片数据原样交给st.image处理
+        return png_bytes
+
+def _append_ai_response(ai_response):
+    """把AI回答加入聊天历史，图表只在加入时解码并缩放一次，重绘时直接使用字节"""
+    if isinstance(ai_response, dict) and 'chart' in ai_response:
+        # 如果响应包含图表数据，分别保存文本和图表
+        chart = ai_response['chart']
+        if isinstance(chart, dict) and isinstance(chart.get('chart_base64'), str):
+            try:
+                chart['_bytes'] = _chat_chart_bytes(chart['chart_base64'])
+            except ValueError:
+                pass
+        st.session_state['chat_history'].append({
+            'role': 'assistant',
+            'content': ai_response['text'],
+            'chart': chart
+        })
+    else:
+        # 普通文本响应
+        st.session_state['chat_history'].append({
+            'role': 'assistant',
+            'content': ai_response
+        })
+    _trim_chat_history()
+
+def _trim_chat_history():
+    """限制聊天历史长度，较早消息的图表只保留缩放后的字节，释放原始base64
+
+    后端只使用历史消息的文本，缩放后的字节比原始base64小，重绘时也无需再解码缩放
+    """
+    history = st.session_state['chat_history'][-CHAT_HISTORY_MAX:]
+    for message in history[:-CHAT_CHART_BASE64_KEEP]:
+        chart = message.get('chart')
+        if isinstance(chart, dict) and chart.get('_bytes') is not None:
+            chart.pop('chart_base64', None)
+    st.session_state['chat_history'] = history
 
 def generate_ai_insight(df, question):
     """通过后端API调用大模型生成AI洞察回答"""
     try:
         # 准备数据上下文
-        data_context = {
-            'shape': list(df.shape),
-            'columns': df.columns.tolist(),
-            'dtypes': df.dtypes.astype(str).to_dict(),
-            'missing_values': df.isnull().sum().to_dict(),
-            'numeric_columns': df.select_dtypes(include=['number']).columns.tolist(),
-            'categorical_columns': df.select_dtypes(include=['object']).columns.tolist()
-        }
+        data_context = _data_context(df)
         
-        # 获取聊天历史
-        chat_history = st.session_state.get('chat_history', [])
+        # 获取聊天历史（本地解码的图表字节不发送给后端）
+        chat_history = [
+            {**message, 'chart': {k: v for k, v in message['chart'].items() if k != '_bytes'}}
+            if isinstance(message.get('chart'), dict) else message
+            for message in st.session_state.get('chat_history', [])
+        ]
         
         # 准备请求数据
         request_data = {
@@ -1488,10 +1869,11 @@ def generate_ai_insight(df, question):
         
         # 调用后端AI API（增加超时时间到180秒以避免浏览器超时）
         backend_url = "http://localhost:7701/api/ai/chat"
-        response = requests.post(backend_url, json=request_data, timeout=180)
+        response = _SESSION.post(backend_url, data=_dumps_json(request_data),
+                                 headers=JSON_HEADERS, timeout=180)
         
         if response.status_code == 200:
-            result = response.json()
+            result = _json_response(response)
             
             if result.get('success'):
                 ai_response = result['response']
@@ -1545,140 +1927,169 @@ def generate_ai_insight(df, question):
     except Exception as e:
         return f"❌ AI分析过程中出现错误：{str(e)}\n\n请检查系统配置或稍后重试。"
 
+# 组件分类显示名称
+CATEGORY_NAMES = {
+    'ai': '🤖 AI智能',
+    'trend': '📈 趋势分析',
+    'comparison': '📊 对比分析',
+    'correlation': '🔗 关联分析',
+    'distribution': '📊 分布分析',
+    'proportion': '🥧 比例分析',
+    'multivariate': '🎯 多元分析',
+    'summary': '📋 汇总展示',
+    'raw_data': '📊 原始数据',
+    'custom': '🎨 自定义',
+    'other': '📁 其他'
+}
+
+# AI分析默认图表类型选项
+CHART_TYPES = {
+    'auto': '🤖 智能推荐',
+    'line': '📈 折线图',
+    'bar': '📊 柱状图',
+    'scatter': '🔵 散点图',
+    'histogram': '📊 直方图',
+    'box': '📦 箱线图',
+    'heatmap': '🔥 热力图',
+    'pie': '🥧 饼图'
+}
+
+# 内置可视化组件，模块加载时构建一次，只读映射避免被会话修改
+_DEFAULT_COMPONENTS = tuple(MappingProxyType(component) for component in [
+    {
+        'id': 'smart_recommend',
+        'name': '智能推荐',
+        'icon': '🤖',
+        'type': 'chart',
+        'category': 'ai',
+        'description': 'AI智能推荐最适合的图表类型',
+        'config': {'auto_select': True, 'priority': 'high'},
+        'persistent': False
+    },
+    {
+        'id': 'line_chart',
+        'name': '折线图',
+        'icon': '📈',
+        'type': 'chart',
+        'category': 'trend',
+        'description': '显示数据随时间的变化趋势',
+        'config': {'chart_type': 'line', 'color': 'blue', 'line_width': 2, 'show_markers': True},
+        'persistent': True
+    },
+    {
+        'id': 'bar_chart',
+        'name': '柱状图',
+        'icon': '📊',
+        'type': 'chart',
+        'category': 'comparison',
+        'description': '比较不同类别的数值大小',
+        'config': {'chart_type': 'bar', 'color': 'green', 'orientation': 'vertical', 'show_values': True},
+        'persistent': True
+    },
+    {
+        'id': 'scatter_plot',
+        'name': '散点图',
+        'icon': '🔵',
+        'type': 'chart',
+        'category': 'correlation',
+        'description': '显示两个变量之间的关系',
+        'config': {'chart_type': 'scatter', 'color': 'red', 'size': 8, 'show_trend': True, 'alpha': 0.7},
+        'persistent': True
+    },
+    {
+        'id': 'pie_chart',
+        'name': '饼图',
+        'icon': '🥧',
+        'type': 'chart',
+        'category': 'proportion',
+        'description': '显示各部分占整体的比例',
+        'config': {'chart_type': 'pie', 'show_percentage': True, 'explode_max': True, 'color_palette': 'Set3'},
+        'persistent': True
+    },
+    {
+        'id': 'heatmap',
+        'name': '热力图',
+        'icon': '🔥',
+        'type': 'chart',
+        'category': 'correlation',
+        'description': '显示数据的密度分布或相关性',
+        'config': {'chart_type': 'heatmap', 'colormap': 'viridis', 'show_values': True, 'center': 0},
+        'persistent': True
+    },
+    {
+        'id': 'histogram',
+        'name': '直方图',
+        'icon': '📊',
+        'type': 'chart',
+        'category': 'distribution',
+        'description': '显示数据的分布情况',
+        'config': {'chart_type': 'histogram', 'bins': 30, 'density': False, 'alpha': 0.8},
+        'persistent': True
+    },
+    {
+        'id': 'box_plot',
+        'name': '箱线图',
+        'icon': '📦',
+        'type': 'chart',
+        'category': 'distribution',
+        'description': '显示数据的分布和异常值',
+        'config': {'chart_type': 'box', 'show_outliers': True, 'notch': False, 'color': 'lightblue'},
+        'persistent': True
+    },
+    {
+        'id': 'violin_plot',
+        'name': '小提琴图',
+        'icon': '🎻',
+        'type': 'chart',
+        'category': 'distribution',
+        'description': '结合箱线图和密度图的优势',
+        'config': {'chart_type': 'violin', 'show_density': True, 'inner': 'box', 'palette': 'muted'},
+        'persistent': True
+    },
+    {
+        'id': 'area_chart',
+        'name': '面积图',
+        'icon': '🏔️',
+        'type': 'chart',
+        'category': 'trend',
+        'description': '强调数量随时间的累积变化',
+        'config': {'chart_type': 'area', 'fill_alpha': 0.7, 'stacked': False, 'color': 'skyblue'},
+        'persistent': True
+    },
+    {
+        'id': 'radar_chart',
+        'name': '雷达图',
+        'icon': '🎯',
+        'type': 'chart',
+        'category': 'multivariate',
+        'description': '多维数据的综合展示',
+        'config': {'chart_type': 'radar', 'fill_area': True, 'line_width': 2, 'alpha': 0.25},
+        'persistent': True
+    },
+    {
+        'id': 'metric_card',
+        'name': '指标卡片',
+        'icon': '📋',
+        'type': 'metric',
+        'category': 'summary',
+        'description': '显示关键指标和KPI',
+        'config': {'show_delta': True, 'color_coding': True, 'format': 'auto'},
+        'persistent': True
+    },
+    {
+        'id': 'data_table',
+        'name': '数据表格',
+        'icon': '📊',
+        'type': 'table',
+        'category': 'raw_data',
+        'description': '以表格形式展示原始数据',
+        'config': {'pagination': True, 'sortable': True, 'searchable': True, 'max_rows': 100},
+        'persistent': True
+    }
+])
+
 def get_available_viz_components():
     """获取可用的可视化组件列表"""
-    default_components = [
-        {
-            'id': 'smart_recommend',
-            'name': '智能推荐',
-            'icon': '🤖',
-            'type': 'chart',
-            'category': 'ai',
-            'description': 'AI智能推荐最适合的图表类型',
-            'config': {'auto_select': True, 'priority': 'high'},
-            'persistent': False
-        },
-        {
-            'id': 'line_chart',
-            'name': '折线图',
-            'icon': '📈',
-            'type': 'chart',
-            'category': 'trend',
-            'description': '显示数据随时间的变化趋势',
-            'config': {'chart_type': 'line', 'color': 'blue', 'line_width': 2, 'show_markers': True},
-            'persistent': True
-        },
-        {
-            'id': 'bar_chart',
-            'name': '柱状图',
-            'icon': '📊',
-            'type': 'chart',
-            'category': 'comparison',
-            'description': '比较不同类别的数值大小',
-            'config': {'chart_type': 'bar', 'color': 'green', 'orientation': 'vertical', 'show_values': True},
-            'persistent': True
-        },
-        {
-            'id': 'scatter_plot',
-            'name': '散点图',
-            'icon': '🔵',
-            'type': 'chart',
-            'category': 'correlation',
-            'description': '显示两个变量之间的关系',
-            'config': {'chart_type': 'scatter', 'color': 'red', 'size': 8, 'show_trend': True, 'alpha': 0.7},
-            'persistent': True
-        },
-        {
-            'id': 'pie_chart',
-            'name': '饼图',
-            'icon': '🥧',
-            'type': 'chart',
-            'category': 'proportion',
-            'description': '显示各部分占整体的比例',
-            'config': {'chart_type': 'pie', 'show_percentage': True, 'explode_max': True, 'color_palette': 'Set3'},
-            'persistent': True
-        },
-        {
-            'id': 'heatmap',
-            'name': '热力图',
-            'icon': '🔥',
-            'type': 'chart',
-            'category': 'correlation',
-            'description': '显示数据的密度分布或相关性',
-            'config': {'chart_type': 'heatmap', 'colormap': 'viridis', 'show_values': True, 'center': 0},
-            'persistent': True
-        },
-        {
-            'id': 'histogram',
-            'name': '直方图',
-            'icon': '📊',
-            'type': 'chart',
-            'category': 'distribution',
-            'description': '显示数据的分布情况',
-            'config': {'chart_type': 'histogram', 'bins': 30, 'density': False, 'alpha': 0.8},
-            'persistent': True
-        },
-        {
-            'id': 'box_plot',
-            'name': '箱线图',
-            'icon': '📦',
-            'type': 'chart',
-            'category': 'distribution',
-            'description': '显示数据的分布和异常值',
-            'config': {'chart_type': 'box', 'show_outliers': True, 'notch': False, 'color': 'lightblue'},
-            'persistent': True
-        },
-        {
-            'id': 'violin_plot',
-            'name': '小提琴图',
-            'icon': '🎻',
-            'type': 'chart',
-            'category': 'distribution',
-            'description': '结合箱线图和密度图的优势',
-            'config': {'chart_type': 'violin', 'show_density': True, 'inner': 'box', 'palette': 'muted'},
-            'persistent': True
-        },
-        {
-            'id': 'area_chart',
-            'name': '面积图',
-            'icon': '🏔️',
-            'type': 'chart',
-            'category': 'trend',
-            'description': '强调数量随时间的累积变化',
-            'config': {'chart_type': 'area', 'fill_alpha': 0.7, 'stacked': False, 'color': 'skyblue'},
-            'persistent': True
-        },
-        {
-            'id': 'radar_chart',
-            'name': '雷达图',
-            'icon': '🎯',
-            'type': 'chart',
-            'category': 'multivariate',
-            'description': '多维数据的综合展示',
-            'config': {'chart_type': 'radar', 'fill_area': True, 'line_width': 2, 'alpha': 0.25},
-            'persistent': True
-        },
-        {
-            'id': 'metric_card',
-            'name': '指标卡片',
-            'icon': '📋',
-            'type': 'metric',
-            'category': 'summary',
-            'description': '显示关键指标和KPI',
-            'config': {'show_delta': True, 'color_coding': True, 'format': 'auto'},
-            'persistent': True
-        },
-        {
-            'id': 'data_table',
-            'name': '数据表格',
-            'icon': '📊',
-            'type': 'table',
-            'category': 'raw_data',
-            'description': '以表格形式展示原始数据',
-            'config': {'pagination': True, 'sortable': True, 'searchable': True, 'max_rows': 100},
-            'persistent': True
-        }
-    ]
     
     # 从持久化存储加载自定义组件
     custom_components = load_custom_components()
@@ -1686,16 +2097,92 @@ def get_available_viz_components():
     # 从session state获取临时组件
     temp_components = st.session_state.get('temp_viz_components', [])
     
+    # 内置组件以普通dict副本放入列表（会存入session_state，需可pickle）
+    default_components = [dict(component, config=dict(component['config'])) for component in _DEFAULT_COMPONENTS]
+    
     return default_components + custom_components + temp_components
 
+def _refresh_viz_components():
+    """重新加载可视化组件列表，并递增版本号使分组缓存失效"""
+    st.session_state['viz_components'] = get_available_viz_components()
+    st.session_state['viz_components_version'] = st.session_state.get('viz_components_version', 0) + 1
+
+def _group_components():
+    """按分类分组的组件列表，组件版本不变时复用本会话中已分好的结果"""
+    version = st.session_state.get('viz_components_version', 0)
+    cached = st.session_state.get('viz_component_groups')
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    component_categories = {}
+    for component in st.session_state['viz_components']:
+        component_categories.setdefault(component.get('category', 'other'), []).append(component)
+    st.session_state['viz_component_groups'] = (version, component_categories)
+    return component_categories
+
+# 自定义组件配置JSON的最大字符数，超过时不再解析
+MAX_COMPONENT_CONFIG_CHARS = 32_768
+
+def _parse_component_config(config_str):
+    """解析组件配置JSON，先检查长度，超过上限时直接拒绝"""
+    if len(config_str) > MAX_COMPONENT_CONFIG_CHARS:
+        raise ValueError(f"配置过大，最多{MAX_COMPONENT_CONFIG_CHARS}个字符")
+    if orjson is not None:
+        return orjson.loads(config_str)
+    return json.loads(config_str)
+
+def _render_add_component_form(prefix):
+    """添加自定义组件表单，组件管理页与AI分析侧边栏共用，prefix用于区分控件key"""
+    with st.form(f"{prefix}_add_component_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            new_component_name = st.text_input("组件名称*", placeholder="例如: 自定义散点图",
+                                               key=f"{prefix}_component_name")
+            new_component_type = st.selectbox("组件类型*", ['chart', 'table', 'metric', 'widget'],
+                                              key=f"{prefix}_component_type")
+            new_component_category = st.selectbox("组件分类*", list(CATEGORY_NAMES.keys()),
+                                                  format_func=lambda k: CATEGORY_NAMES[k],
+                                                  key=f"{prefix}_component_category")
+        
+        with col2:
+            new_component_icon = st.text_input("图标 (emoji)*", "🎨", placeholder="例如: 📊",
+                                               key=f"{prefix}_component_icon")
+            new_component_description = st.text_input("描述", placeholder="组件功能描述",
+                                                      key=f"{prefix}_component_description")
+            new_component_persistent = st.checkbox("持久化保存", value=True,
+                                                   key=f"{prefix}_component_persistent")
+        
+        new_component_config = st.text_area(
+            "配置 (JSON格式)*", 
+            '{"color": "blue", "style": "modern"}',
+            help="组件的配置参数，必须是有效的JSON格式",
+            height=100,
+            key=f"{prefix}_component_config"
+        )
+        
+        submitted = st.form_submit_button("添加组件", type="primary", use_container_width=True)
+    
+    if submitted:
+        if new_component_name and new_component_config:
+            # 配置校验在add_custom_viz_component中完成，失败时由其提示错误
+            if add_custom_viz_component(
+                new_component_name, 
+                new_component_type, 
+                new_component_config,
+                new_component_category,
+                new_component_description,
+                new_component_icon,
+                new_component_persistent
+            ):
+                st.success(f"✅ 成功添加组件: {new_component_name}")
+                st.rerun()
+        else:
+            st.error("❌ 请填写必填字段（标记*的字段）")
+
 def add_custom_viz_component(name, component_type, config_str, category='custom', description='', icon='🎨', persistent=True):
     """添加自定义可视化组件"""
     try:
-        import json
-        import uuid
-        from datetime import datetime
-        
-        config = json.loads(config_str)
+        config = _parse_component_config(config_str)
         
         # 生成唯一ID
         component_id = f"custom_{uuid.uuid4().hex[:8]}_{name.lower().replace(' ', '_').replace('-', '_')}"
@@ -1724,102 +2211,15 @@ def add_custom_viz_component(name, component_type, config_str, category='custom'
             st.session_state['temp_viz_components'].append(new_component)
         
         # 更新可视化组件列表
-        st.session_state['viz_components'] = get_available_viz_components()
+        _refresh_viz_components()
         
         return True
         
     except json.JSONDecodeError:
         st.error("配置格式错误，请输入有效的JSON格式")
         return False
-
-def save_custom_component(component):
-    """保存自定义组件到持久化存储"""
-    try:
-        import os
-        import json
-        
-        # 创建组件存储目录
-        components_dir = os.path.join(os.path.dirname(__file__), 'custom_components')
-        os.makedirs(components_dir, exist_ok=True)
-        
-        # 保存组件配置文件
-        component_file = os.path.join(components_dir, f"{component['id']}.json")
-        with open(component_file, 'w', encoding='utf-8') as f:
-            json.dump(component, f, ensure_ascii=False, indent=2)
-        
-        return True
-        
-    except Exception as e:
-        st.error(f"保存组件失败: {str(e)}")
-        return False
-
-def delete_custom_component(component_id):
-    """删除自定义组件"""
-    try:
-        import os
-        
-        components_dir = os.path.join(os.path.dirname(__file__), 'custom_components')
-        component_file = os.path.join(components_dir, f"{component_id}.json")
-        
-        if os.path.exists(component_file):
-            os.remove(component_file)
-            return True
-        else:
-            st.warning(f"组件文件不存在: {component_id}")
-            return False
-            
-    except Exception as e:
-        st.error(f"删除组件失败: {str(e)}")
-        return False
-
-def load_custom_components():
-    """加载所有自定义组件"""
-    try:
-        import os
-        import json
-        
-        components = []
-        components_dir = os.path.join(os.path.dirname(__file__), 'custom_components')
-        
-        if os.path.exists(components_dir):
-            for filename in os.listdir(components_dir):
-                if filename.endswith('.json'):
-                    component_file = os.path.join(components_dir, filename)
-                    try:
-                        with open(component_file, 'r', encoding='utf-8') as f:
-                            component = json.load(f)
-                            components.append(component)
-                    except Exception as e:
-                        st.warning(f"加载组件文件失败 {filename}: {str(e)}")
-        
-        return components
-        
-    except Exception as e:
-        st.error(f"加载自定义组件失败: {str(e)}")
-        return []
-
-def export_custom_components():
-    """导出所有自定义组件"""
-    try:
-        import json
-        
-        custom_components = load_custom_components()
-        if custom_components:
-            export_data = {
-                'version': '1.0',
-                'export_time': pd.Timestamp.now().isoformat(),
-                'components': custom_components
-            }
-            return json.dumps(export_data, ensure_ascii=False, indent=2)
-        else:
-            st.warning("没有自定义组件可导出")
-            return None
-            
-    except Exception as e:
-        st.error(f"导出组件失败: {str(e)}")
-        return None
-    except Exception as e:
-        st.error(f"添加组件失败: {str(e)}")
+    except ValueError as e:
+        st.error(str(e))
         return False
 
 def remove_viz_component(component_id):
@@ -1837,7 +2237,7 @@ def remove_viz_component(component_id):
             ]
         
         # 更新可视化组件列表
-        st.session_state['viz_components'] = get_available_viz_components()
+        _refresh_viz_components()
         
         return True
         
@@ -1848,11 +2248,10 @@ def remove_viz_component(component_id):
 def get_chart_recommendations(df):
     """获取图表推荐"""
     try:
-        import numpy as np
-        
         # 构建数据上下文
-        numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_columns = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        kinds = _col_kinds(df)
+        numeric_columns = list(kinds['numeric'])
+        categorical_columns = list(kinds['categorical'])
         
         # 转换numpy类型为Python原生类型，避免JSON序列化错误
         data_context = {
@@ -1860,17 +2259,11 @@ def get_chart_recommendations(df):
             'total_columns': int(len(df.columns)),
             'numeric_columns': numeric_columns,
             'categorical_columns': categorical_columns,
-            'column_info': {
-                col: {
-                    'type': str(df[col].dtype),
-                    'unique_values': int(df[col].nunique()),
-                    'null_count': int(df[col].isnull().sum())
-                } for col in df.columns
-            }
+            'column_info': _column_info(df)
         }
         
         # 调用后端推荐API
-        response = requests.post(
+        response = _SESSION.post(
             'http://localhost:7701/api/chart/recommendations',
             json={
                 'data_context': data_context,
@@ -1906,7 +2299,7 @@ def generate_chart_from_config(df, visualization_config):
             visualization_config['chart_type'] = st.session_state['selected_chart_type']
         
         # 调用后端图表生成API
-        response = requests.post(
+        response = _SESSION.post(
             'http://localhost:7701/api/generate_chart',
             json={
                 'data': df.to_dict('records'),
@@ -1931,21 +2324,92 @@ def generate_chart_from_config(df, visualization_config):
         st.error(f"图表生成失败: {str(e)}")
         return None
 
+# 自定义组件持久化文件
+CUSTOM_COMPONENTS_DIR = os.path.expanduser("~/.jdc_data_tool")
+CUSTOM_COMPONENTS_FILE = os.path.join(CUSTOM_COMPONENTS_DIR, "custom_components.json")
+
+def _custom_components_signature():
+    """组件文件签名：一次stat得到(修改时间, 大小)，文件不存在时为None"""
+    try:
+        stat = os.stat(CUSTOM_COMPONENTS_FILE)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _invalidate_custom_components_cache():
+    """组件文件写入后清除本会话缓存的组件列表"""
+    st.session_state.pop('_custom_components_cache', None)
+
+def _write_custom_components(components):
+    """把全部自定义组件一次写入组件文件"""
+    os.makedirs(CUSTOM_COMPONENTS_DIR, exist_ok=True)
+    with open(CUSTOM_COMPONENTS_FILE, 'w', encoding='utf-8') as f:
+        json.dump({
+            'components': components,
+            'last_updated': pd.Timestamp.now().isoformat()
+        }, f, ensure_ascii=False, indent=2)
+    _invalidate_custom_components_cache()
+
+# 旧版按组件分文件保存的目录，加载时一次性合并进组件文件
+LEGACY_COMPONENTS_DIR = os.path.join(os.path.dirname(__file__), 'custom_components')
+
+def _migrate_legacy_components():
+    """把旧版custom_components目录中的组件合并进组件文件
+    
+    只删除已迁移的*.json文件，目录变空时才删除目录；每个会话只尝试一次，失败时不再重复提示
+    """
+    st.session_state['_legacy_components_checked'] = True
+    try:
+        legacy_paths = []
+        legacy_components = []
+        with os.scandir(LEGACY_COMPONENTS_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json') and entry.is_file():
+                    with open(entry.path, 'r', encoding='utf-8') as f:
+                        legacy_components.append(json.load(f))
+                    legacy_paths.append(entry.path)
+        
+        if legacy_components:
+            components = []
+            if os.path.exists(CUSTOM_COMPONENTS_FILE):
+                with open(CUSTOM_COMPONENTS_FILE, 'r', encoding='utf-8') as f:
+                    components = json.load(f).get('components', [])
+            # 同ID组件以组件文件中的为准
+            existing_ids = {comp['id'] for comp in components}
+            components.extend(comp for comp in legacy_components if comp['id'] not in existing_ids)
+            _write_custom_components(components)
+        
+        for path in legacy_paths:
+            os.remove(path)
+        try:
+            os.rmdir(LEGACY_COMPONENTS_DIR)
+        except OSError:
+            # 目录中还有其他文件，保留目录
+            pass
+        
+    except Exception as e:
+        st.warning(f"迁移旧版自定义组件失败: {str(e)}")
+
 def load_custom_components():
-    """从持久化存储加载自定义组件"""
+    """从持久化存储加载自定义组件，文件签名不变时直接返回本会话缓存的结果"""
     try:
-        import os
-        import json
+        if (not st.session_state.get('_legacy_components_checked')
+                and os.path.isdir(LEGACY_COMPONENTS_DIR)):
+            _migrate_legacy_components()
         
-        config_dir = os.path.expanduser("~/.jdc_data_tool")
-        config_file = os.path.join(config_dir, "custom_components.json")
+        signature = _custom_components_signature()
+        if signature is None:
+            return []
         
-        if os.path.exists(config_file):
-            with open(config_file, 'r', encoding='utf-8') as f:
-                components_data = json.load(f)
-                return components_data.get('components', [])
+        cached = st.session_state.get('_custom_components_cache')
+        if cached is not None and cached[0] == signature:
+            return list(cached[1])
         
-        return []
+        with open(CUSTOM_COMPONENTS_FILE, 'r', encoding='utf-8') as f:
+            components_data = json.load(f)
+        components = components_data.get('components', [])
+        st.session_state['_custom_components_cache'] = (signature, components)
+        return list(components)
         
     except Exception as e:
         st.error(f"加载自定义组件失败: {str(e)}")
@@ -1953,35 +2417,18 @@ def load_custom_components():
 
 def save_custom_component(component):
     """保存自定义组件到持久化存储"""
+    return save_custom_components_bulk([component])
+
+def save_custom_components_bulk(new_components):
+    """批量保存自定义组件：现有组件只加载一次，全部合并后一次写入文件"""
     try:
-        import os
-        import json
-        
-        config_dir = os.path.expanduser("~/.jdc_data_tool")
-        os.makedirs(config_dir, exist_ok=True)
-        config_file = os.path.join(config_dir, "custom_components.json")
-        
-        # 加载现有组件
-        components = load_custom_components()
-        
-        # 检查是否已存在同ID组件
-        existing_index = None
-        for i, comp in enumerate(components):
-            if comp['id'] == component['id']:
-                existing_index = i
-                break
-        
-        if existing_index is not None:
-            components[existing_index] = component
-        else:
-            components.append(component)
+        # 按ID索引现有组件，同ID组件原位替换
+        components = {comp['id']: comp for comp in load_custom_components()}
+        for component in new_components:
+            components[component['id']] = component
         
         # 保存到文件
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'components': components,
-                'last_updated': pd.Timestamp.now().isoformat()
-            }, f, ensure_ascii=False, indent=2)
+        _write_custom_components(list(components.values()))
         
         return True
         
@@ -1992,13 +2439,7 @@ def save_custom_component(component):
 def delete_custom_component(component_id):
     """从持久化存储删除自定义组件"""
     try:
-        import os
-        import json
-        
-        config_dir = os.path.expanduser("~/.jdc_data_tool")
-        config_file = os.path.join(config_dir, "custom_components.json")
-        
-        if not os.path.exists(config_file):
+        if not os.path.exists(CUSTOM_COMPONENTS_FILE):
             return False
         
         # 加载现有组件
@@ -2012,11 +2453,7 @@ def delete_custom_component(component_id):
             return False  # 没有找到要删除的组件
         
         # 保存更新后的组件列表
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'components': components,
-                'last_updated': pd.Timestamp.now().isoformat()
-            }, f, ensure_ascii=False, indent=2)
+        _write_custom_components(components)
         
         return True
         
@@ -2027,8 +2464,6 @@ def delete_custom_component(component_id):
 def export_custom_components():
     """导出所有自定义组件"""
     try:
-        import json
-        
         components = load_custom_components()
         
         export_data = {
@@ -2050,11 +2485,11 @@ def export_custom_components():
 def import_custom_components(uploaded_file):
     """导入自定义组件"""
     try:
-        import json
-        
-        # 读取上传的文件
-        content = uploaded_file.read().decode('utf-8')
-        import_data = json.loads(content)
+        # 直接解析上传文件的字节，不先解码成完整的字符串
+        if orjson is not None:
+            import_data = orjson.loads(uploaded_file.getbuffer())
+        else:
+            import_data = json.load(uploaded_file)
         
         # 验证文件格式
         if 'components' not in import_data:
@@ -2063,18 +2498,18 @@ def import_custom_components(uploaded_file):
         
         imported_components = import_data['components']
         
-        # 逐个导入组件
-        success_count = 0
+        # 为导入的组件生成新的ID以避免冲突，然后一次性保存
+        import_time = pd.Timestamp.now().isoformat()
         for component in imported_components:
-            # 为导入的组件生成新的ID以避免冲突
-            import uuid
             original_id = component['id']
             component['id'] = f"imported_{uuid.uuid4().hex[:8]}_{original_id}"
             component['imported'] = True
-            component['import_time'] = pd.Timestamp.now().isoformat()
-            
-            if save_custom_component(component):
-                success_count += 1
+            component['import_time'] = import_time
+        
+        success_count = len(imported_components) if save_custom_components_bulk(imported_components) else 0
+        
+        # 更新可视化组件列表
+        _refresh_viz_components()
         
         st.success(f"成功导入 {success_count}/{len(imported_components)} 个组件")
         return True